@@ -0,0 +1,500 @@
+"""
+Benchmark suite for the engine hot paths.
+
+Usage:
+    python -m benchmarks.run --quick                 # small sizes only
+    python -m benchmarks.run                         # full suite (40x25 .. 2048x2048)
+    python -m benchmarks.run --save-baseline         # store results as the new baseline
+    python -m benchmarks.run --only route,layer      # run a subset by name prefix
+
+Results are compared against benchmarks/baseline.json (if present); any
+benchmark slower than the baseline by more than --tolerance is reported as a
+regression and the process exits with status 1.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Draw benchmarks need a surface but no window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from engine.config import FONT_NAME, FONT_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+from engine.combat import RoundSystem
+from engine.config_loader import config_manager
+from engine.entities import Entity
+from engine.importer import ScenarioCache, ScenarioImporter
+from engine.inventory import Inventory, ItemRegistry
+from engine.layers import Layer
+from engine.pathfinding import HierarchicalPathfinder, grid_astar
+from engine.playfield import Playfield
+from engine.resolution import CombatResolver
+from engine.scenario_server import start_server
+from engine.schema import validate_scenario
+from engine.terrain import generate_terrain, make_rng
+from engine.terrain_store import TerrainStore
+from . import scenarios
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Per-tile rendering is far slower than the rest of the engine, so the draw
+# benchmark stops at this many tiles instead of running for minutes.
+MAX_DRAW_TILES = 512 * 512
+LAYER_ACCESS_OPS = 100000
+COMBAT_ACTIONS = 1000
+IMPORT_SCENARIOS = 50
+SCHEMA_DOCUMENTS = 1000
+# Grid searches are expensive, so route benchmarks run few queries and
+# full-grid A* stops at a smaller map size than HPA*.
+PATH_QUERIES = 20
+MAX_ASTAR_TILES = 512 * 512
+MAX_HPA_TILES = 1024 * 1024
+
+
+@contextlib.contextmanager
+def isolated_config_dir():
+    """
+    Points the global ConfigManager at a temporary directory so benchmarks
+    never touch the real world/characters configs.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_manager._get_config_path = (
+            lambda config_type: os.path.join(tmpdir, f"{config_type}_config.json")
+        )
+        try:
+            yield tmpdir
+        finally:
+            del config_manager._get_config_path
+
+
+def time_it(setup, repeat):
+    """
+    Calls setup() untimed, then times the callable it returns.
+    Repeats that repeat times and returns timing stats in seconds.
+    One untimed warm-up call runs first, so lazy imports and first-call
+    caches don't land in the samples.
+    """
+    setup()()
+    samples = []
+    for _ in range(repeat):
+        run = setup()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "repeat": repeat
+    }
+
+
+def build_playfield(width, height, config_dir):
+    """Writes a generated world config and loads it into a fresh Playfield."""
+    config = scenarios.make_world_config(width, height)
+    config_manager.save_config("world", config, force=True)
+    playfield = Playfield(width, height)
+    playfield.init_from_config(os.path.join(config_dir, "world_config.json"))
+    return playfield
+
+
+def name_filter(only):
+    """Returns wanted(name) for the --only name prefixes (everything if none)."""
+    if not only:
+        return lambda name: True
+    return lambda name: any(name.startswith(prefix) for prefix in only)
+
+
+# ---------------------------------------------------------------------
+# Benchmarks. Each yields (name, setup) pairs where setup() returns the
+# callable to time. wanted(name) says whether a benchmark was selected;
+# expensive shared setup is skipped when nothing that uses it is.
+# ---------------------------------------------------------------------
+def bench_layer(sizes, entity_counts, config_dir, wanted):
+    for width, height in sizes:
+        yield f"layer_construct[{width}x{height}]", (
+            lambda w=width, h=height: lambda: Layer(w, h, fill_tile=2)
+        )
+
+        name = f"layer_access[{width}x{height}]"
+        if not wanted(name):
+            continue
+        layer = Layer(width, height, fill_tile=2)
+        coords = scenarios.make_entity_positions(LAYER_ACCESS_OPS, width, height)
+
+        def access(layer=layer, coords=coords):
+            def run():
+                get_z = layer.get_z
+                set_tile = layer.set_tile
+                for x, y in coords:
+                    set_tile(x, y, 4, get_z(x, y) + 1)
+            return run
+        yield name, access
+
+
+def bench_playfield_init(sizes, entity_counts, config_dir, wanted):
+    path = os.path.join(config_dir, "world_config.json")
+    for width, height in sizes:
+        def init(w=width, h=height):
+            config_manager.save_config("world", scenarios.make_world_config(w, h), force=True)
+            playfield = Playfield(w, h)
+            return lambda: playfield.init_from_config(path)
+        yield f"playfield_init[{width}x{height}]", init
+
+
+def bench_terrain(sizes, entity_counts, config_dir, wanted):
+    terrain_cfg = scenarios.make_terrain_config()
+    for width, height in sizes:
+        yield f"terrain_generate[{width}x{height}]", (
+            lambda w=width, h=height: lambda: generate_terrain(
+                w, h, terrain_cfg, make_rng(scenarios.DEFAULT_SEED), fill_tile=2
+            )
+        )
+
+
+def bench_shared_terrain(sizes, entity_counts, config_dir, wanted):
+    store = TerrainStore()
+    try:
+        for width, height in sizes:
+            if not wanted(f"terrain_attach[{width}x{height}]"):
+                continue
+            name = f"bench_{os.getpid()}_{width}x{height}"
+            store.publish(name, build_playfield(width, height, config_dir))
+
+            def attach(name=name, w=width, h=height):
+                def run():
+                    playfield = Playfield(w, h)
+                    playfield.attach_terrain(name)
+                    playfield.layers[0].set_tile(0, 0, 1)
+                    del playfield
+                return run
+            yield f"terrain_attach[{width}x{height}]", attach
+    finally:
+        store.close()
+
+
+def bench_entity_move(sizes, entity_counts, config_dir, wanted):
+    width, height = sizes[min(1, len(sizes) - 1)]
+    if not any(wanted(f"entity_move[{count}@{width}x{height}]") for count in entity_counts):
+        return
+    playfield = build_playfield(width, height, config_dir)
+    for count in entity_counts:
+        def move(count=count):
+            positions = scenarios.make_entity_positions(count, width, height)
+            entities = [Entity(x, y) for x, y in positions]
+
+            def run():
+                for entity in entities:
+                    entity.move_to((entity.x + 1) % width, entity.y, playfield)
+            return run
+        yield f"entity_move[{count}@{width}x{height}]", move
+
+
+def bench_pathfinding(sizes, entity_counts, config_dir, wanted):
+    for width, height in sizes:
+        if width * height > MAX_HPA_TILES:
+            continue
+        names = [f"hpa_build[{width}x{height}]", f"route_hpa[{PATH_QUERIES}@{width}x{height}]",
+                 f"route_astar[{PATH_QUERIES}@{width}x{height}]"]
+        if not any(wanted(name) for name in names):
+            continue
+        playfield = build_playfield(width, height, config_dir)
+        queries = scenarios.make_route_queries(PATH_QUERIES, width, height)
+
+        yield names[0], (
+            lambda playfield=playfield: lambda: HierarchicalPathfinder(playfield).close()
+        )
+
+        if not (wanted(names[1]) or wanted(names[2])):
+            continue
+        pathfinder = HierarchicalPathfinder(playfield)
+        # Warm the lazily computed cluster costs once; the timed runs then
+        # measure steady-state queries.
+        for start, end in queries:
+            pathfinder.find_path(start, end)
+
+        def hpa(pathfinder=pathfinder, queries=queries):
+            def run():
+                for start, end in queries:
+                    pathfinder.find_path(start, end)
+            return run
+        yield names[1], hpa
+
+        if width * height > MAX_ASTAR_TILES:
+            continue
+
+        def astar(grid=pathfinder.grid, queries=queries):
+            def run():
+                for (sx, sy), (ex, ey) in queries:
+                    grid_astar(grid, sy * grid.width + sx, ey * grid.width + ex)
+            return run
+        yield names[2], astar
+
+
+def bench_initiative(sizes, entity_counts, config_dir, wanted):
+    for count in entity_counts:
+        def round_(count=count):
+            positions = scenarios.make_entity_positions(count, 40, 25)
+            speeds = scenarios.make_character_config(count)
+            entities = []
+            for (x, y), stats in zip(positions, speeds.values()):
+                entity = Entity(x, y)
+                entity.speed = stats["speed"]
+                entity.max_ap = stats["max_ap"]
+                entities.append(entity)
+            round_system = RoundSystem()
+
+            def run():
+                round_system.start_round(entities)
+                while round_system.next_turn():
+                    pass
+            return run
+        yield f"initiative_round[{count}]", round_
+
+
+def bench_combat(sizes, entity_counts, config_dir, wanted):
+    width, height = sizes[min(1, len(sizes) - 1)]
+    fireball = {"damage": 30, "shape": "circle", "radius": 3, "falloff": 0.5, "status": "burning"}
+    for count in entity_counts:
+        def resolve(count=count):
+            playfield = Playfield(width, height)
+            for x, y in scenarios.make_entity_positions(count, width, height):
+                playfield.add_entity(Entity(x, y))
+            resolver = CombatResolver(playfield)
+            targets = scenarios.make_entity_positions(COMBAT_ACTIONS, width, height, seed=7)
+
+            def run():
+                for x, y in targets:
+                    resolver.resolve(None, fireball, x, y)
+            return run
+        yield f"combat_resolve[{COMBAT_ACTIONS}x{count}@{width}x{height}]", resolve
+
+        def resolve_batch(count=count):
+            playfield = Playfield(width, height)
+            for x, y in scenarios.make_entity_positions(count, width, height):
+                playfield.add_entity(Entity(x, y))
+            resolver = CombatResolver(playfield)
+            actions = [
+                (None, fireball, x, y)
+                for x, y in scenarios.make_entity_positions(COMBAT_ACTIONS, width, height, seed=7)
+            ]
+            return lambda: resolver.resolve_batch(actions)
+        yield f"combat_batch[{COMBAT_ACTIONS}x{count}@{width}x{height}]", resolve_batch
+
+
+def bench_inventory(sizes, entity_counts, config_dir, wanted):
+    if not any(wanted(f"inventory_load[{count}]") for count in entity_counts):
+        return
+    items = scenarios.make_item_definitions()
+    registry = ItemRegistry()
+    registry.load_items(items)
+    for count in entity_counts:
+        rosters = scenarios.make_inventories(count, items)
+
+        def load(rosters=rosters):
+            def run():
+                for counts in rosters:
+                    inventory = Inventory.from_dict(counts, registry)
+                    inventory.items_in_category("consumable")
+                    inventory.total_weight
+            return run
+        yield f"inventory_load[{count}]", load
+
+
+def bench_import(sizes, entity_counts, config_dir, wanted):
+    if not (wanted(f"import_prefetch[{IMPORT_SCENARIOS}]") or
+            wanted(f"import_cached[{IMPORT_SCENARIOS}]")):
+        return
+    width, height = sizes[0]
+    scenario = scenarios.make_world_config(width, height)
+    server = start_server(scenarios={f"s{i}": scenario for i in range(IMPORT_SCENARIOS)})
+    ids = [f"s{i}" for i in range(IMPORT_SCENARIOS)]
+
+    def prefetch(cache_factory):
+        def setup():
+            cache = cache_factory()
+
+            return lambda: asyncio.run(load(cache))
+        return setup
+
+    async def load(cache):
+        importer = ScenarioImporter(server.base_url, cache)
+        try:
+            await importer.prefetch(ids)
+        finally:
+            await importer.close()
+
+    try:
+        yield f"import_prefetch[{IMPORT_SCENARIOS}]", prefetch(ScenarioCache)
+        warm = ScenarioCache()
+        asyncio.run(load(warm))
+        yield f"import_cached[{IMPORT_SCENARIOS}]", prefetch(lambda: warm)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_schema(sizes, entity_counts, config_dir, wanted):
+    width, height = sizes[0]
+    name = f"schema_validate[{SCHEMA_DOCUMENTS}@{width}x{height}]"
+    if not wanted(name):
+        return
+    document = scenarios.make_world_config(width, height)
+    document["characters"] = scenarios.make_character_config(10, width, height)
+    documents = [json.loads(json.dumps(document)) for _ in range(SCHEMA_DOCUMENTS)]
+
+    def validate():
+        def run():
+            for doc in documents:
+                validate_scenario(doc)
+        return run
+    yield name, validate
+
+
+def bench_draw(sizes, entity_counts, config_dir, wanted):
+    sizes = [(width, height) for width, height in sizes
+             if width * height <= MAX_DRAW_TILES and wanted(f"playfield_draw[{width}x{height}]")]
+    if not sizes:
+        return
+    pygame.display.init()
+    pygame.font.init()
+    font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for width, height in sizes:
+        playfield = build_playfield(width, height, config_dir)
+        for x, y in scenarios.make_entity_positions(min(entity_counts[-1], 100), width, height):
+            playfield.add_entity(Entity(x, y))
+        yield f"playfield_draw[{width}x{height}]", (
+            lambda playfield=playfield: lambda: playfield.draw(surface, font)
+        )
+
+
+def bench_config(sizes, entity_counts, config_dir, wanted):
+    for count in entity_counts:
+        data = scenarios.make_character_config(count)
+
+        def save(data=data):
+            return lambda: config_manager.save_config("characters", data, force=True)
+        yield f"config_save[{count}]", save
+
+        def load(data=data):
+            config_manager.save_config("characters", data, force=True)
+            return lambda: config_manager.load_config("characters")
+        yield f"config_load[{count}]", load
+
+
+BENCHMARKS = [
+    bench_layer,
+    bench_playfield_init,
+    bench_terrain,
+    bench_shared_terrain,
+    bench_entity_move,
+    bench_pathfinding,
+    bench_initiative,
+    bench_combat,
+    bench_inventory,
+    bench_import,
+    bench_schema,
+    bench_draw,
+    bench_config,
+]
+
+
+def run_benchmarks(sizes, entity_counts, repeat, only=None, out=sys.stdout):
+    results = {}
+    wanted = name_filter(only)
+    with isolated_config_dir() as config_dir:
+        for bench in BENCHMARKS:
+            for name, setup in bench(sizes, entity_counts, config_dir, wanted):
+                if not wanted(name):
+                    continue
+                stats = time_it(setup, repeat)
+                results[name] = stats
+                print(f"{name:<40} min {stats['min'] * 1000:10.3f} ms  "
+                      f"median {stats['median'] * 1000:10.3f} ms", file=out)
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance, out=sys.stdout):
+    """
+    Compares min timings against the baseline.
+    Returns the list of (name, ratio) pairs that regressed beyond tolerance.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("min"):
+            continue
+        ratio = stats["min"] / base["min"]
+        marker = ""
+        if ratio > 1 + tolerance:
+            regressions.append((name, ratio))
+            marker = "  REGRESSION"
+        elif ratio < 1 - tolerance:
+            marker = "  faster"
+        print(f"{name:<40} {ratio:6.2f}x baseline{marker}", file=out)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine hot paths.")
+    parser.add_argument("--quick", action="store_true",
+                        help="only run the small map sizes and entity counts")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timed runs per benchmark (default: 5)")
+    parser.add_argument("--only", default="",
+                        help="comma-separated benchmark name prefixes to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON file to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before flagging a regression (default: 0.25)")
+    parser.add_argument("--output", help="also write the results JSON to this path")
+    args = parser.parse_args(argv)
+
+    sizes = scenarios.QUICK_MAP_SIZES if args.quick else scenarios.MAP_SIZES
+    entity_counts = scenarios.QUICK_ENTITY_COUNTS if args.quick else scenarios.ENTITY_COUNTS
+    only = [prefix for prefix in args.only.split(",") if prefix]
+
+    results = run_benchmarks(sizes, entity_counts, args.repeat, only)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    print()
+    regressions = compare_to_baseline(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
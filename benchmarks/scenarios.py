@@ -0,0 +1,118 @@
+import random
+
+# Map sizes covered by the suite, from the default 40x25 arena up to the
+# largest arenas we expect to host.
+MAP_SIZES = [(40, 25), (128, 128), (512, 512), (1024, 1024), (2048, 2048)]
+QUICK_MAP_SIZES = [(40, 25), (128, 128)]
+
+ENTITY_COUNTS = [1, 10, 100, 1000, 10000]
+QUICK_ENTITY_COUNTS = [1, 100]
+
+DEFAULT_SEED = 1234
+
+
+def make_world_config(width, height, seed=DEFAULT_SEED):
+    """
+    Builds a world config dict shaped like world_config.json.
+    Wall/mountain counts and the explicit layout scale with the map area,
+    so every size exercises the same code paths with a similar density.
+    """
+    rng = random.Random(seed)
+    area = width * height
+    layout = []
+    for _ in range(max(1, area // 100)):
+        layout.append({
+            "x": rng.randrange(width),
+            "y": rng.randrange(height),
+            "tile_id": rng.choice([3, 4]),
+            "z": rng.randint(-2, 3)
+        })
+    return {
+        "width": width,
+        "height": height,
+        "player_start": {"x": width // 2, "y": height // 2, "z": 0},
+        "layers": [
+            {
+                "fill_tile": 2,
+                "random_walls": {"count": area // 50, "variance": area // 500},
+                "random_mountains": area // 200,
+                "layout": layout
+            }
+        ]
+    }
+
+
+def make_terrain_config():
+    """Terrain config exercising every stage of the procedural generator."""
+    return {
+        "heightmap": {"scale": 32, "octaves": 4, "min_z": -3, "max_z": 6},
+        "water_level": -2,
+        "mountain_level": 5,
+        "walls": {"density": 0.15, "scale": 6},
+        "connected": True
+    }
+
+
+def make_character_config(entity_count, width=40, height=25, seed=DEFAULT_SEED):
+    """
+    Builds a characters config dict shaped like characters_config.json,
+    with one "player" entry plus entity_count - 1 additional units.
+    """
+    rng = random.Random(seed)
+    config = {}
+    for i in range(entity_count):
+        key = "player" if i == 0 else f"unit_{i}"
+        config[key] = {
+            "current_ap": 100,
+            "max_ap": 100,
+            "speed": rng.randint(1, 10),
+            "pos": {"x": rng.randrange(width), "y": rng.randrange(height), "z": 0}
+        }
+    return config
+
+
+def make_item_definitions(count=200, seed=DEFAULT_SEED):
+    """Builds count item dicts shaped like items_config.json entries."""
+    rng = random.Random(seed)
+    categories = ["consumable", "weapon", "armor", "material"]
+    tags = ["fire", "ice", "healing", "metal", "thrown", "rare"]
+    return [
+        {
+            "id": f"item_{i}",
+            "name": f"Item {i}",
+            "category": rng.choice(categories),
+            "weight": round(rng.uniform(0, 10), 1),
+            "value": rng.randint(1, 500),
+            "max_stack": rng.choice([1, 5, 10, 99]),
+            "tags": rng.sample(tags, rng.randint(0, 3))
+        }
+        for i in range(count)
+    ]
+
+
+def make_inventories(entity_count, items, per_entity=10, seed=DEFAULT_SEED):
+    """Returns one {item_id: count} dict per entity, as stored in a roster."""
+    rng = random.Random(seed)
+    ids = [item["id"] for item in items]
+    return [
+        {item_id: rng.randint(1, 20) for item_id in rng.sample(ids, per_entity)}
+        for _ in range(entity_count)
+    ]
+
+
+def make_entity_positions(entity_count, width, height, seed=DEFAULT_SEED):
+    """Returns entity_count reproducible (x, y) positions inside the map."""
+    rng = random.Random(seed)
+    return [(rng.randrange(width), rng.randrange(height)) for _ in range(entity_count)]
+
+
+def make_route_queries(count, width, height, seed=DEFAULT_SEED):
+    """Returns count reproducible (start, end) tile pairs inside the map."""
+    rng = random.Random(seed)
+    return [
+        (
+            (rng.randrange(width), rng.randrange(height)),
+            (rng.randrange(width), rng.randrange(height))
+        )
+        for _ in range(count)
+    ]
@@ -1,12 +1,154 @@
+import heapq
+import itertools
 from .config_loader import save_world_state, save_character_state
 
+# Queue tiers: interrupts act before pending reactions, which act before
+# regular turns. Within a tier, higher initiative goes first.
+INTERRUPT = 0
+REACTION = 1
+TURN = 2
+
+TURN_KINDS = {INTERRUPT: "interrupt", REACTION: "reaction", TURN: "turn"}
+
+
+class InitiativeScheduler:
+    """
+    Heap-backed turn order for one round.
+
+    Entities are ordered by initiative (their speed unless given), highest
+    first, ties broken by the order they were added. Every per-turn
+    operation (next_actor, delay, interrupt, react, remove) is O(log n);
+    removed or rescheduled entries are left in the heap and skipped when
+    popped, and the heap is compacted once they outnumber live entries.
+    """
+    def __init__(self):
+        self.heap = []
+        self.entries = {}  # (entity, tier) -> live heap entry
+        self.counter = itertools.count()
+        self.stale = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _entry(self, entity, tier, initiative):
+        return [tier, -initiative, next(self.counter), entity]
+
+    def reset(self, entities):
+        """Queues a regular turn for every entity; O(n) via heapify."""
+        self.heap = [
+            self._entry(entity, TURN, getattr(entity, "speed", 0))
+            for entity in entities
+        ]
+        heapq.heapify(self.heap)
+        self.entries = {(entry[3], TURN): entry for entry in self.heap}
+        self.stale = 0
+
+    def add(self, entity, initiative=None, tier=TURN):
+        """Queues entity, replacing any pending entry of the same tier."""
+        if initiative is None:
+            initiative = getattr(entity, "speed", 0)
+        self._discard(entity, tier)
+        entry = self._entry(entity, tier, initiative)
+        self.entries[(entity, tier)] = entry
+        heapq.heappush(self.heap, entry)
+
+    def remove(self, entity):
+        """Drops every pending turn, interrupt and reaction of entity."""
+        for tier in TURN_KINDS:
+            self._discard(entity, tier)
+
+    def delay(self, entity, initiative):
+        """
+        Moves entity's regular turn to the given initiative, which may not
+        be higher than its current one. Returns False (and changes nothing)
+        if the turn is no longer pending or the initiative is higher.
+        """
+        entry = self.entries.get((entity, TURN))
+        if entry is None or initiative > -entry[1]:
+            return False
+        self.add(entity, initiative, TURN)
+        return True
+
+    def interrupt(self, entity):
+        """
+        Lets entity act next, using up its regular turn for this round.
+        Returns False (and queues nothing) if that turn is no longer pending,
+        e.g. because the entity has already acted.
+        """
+        if (entity, TURN) not in self.entries:
+            return False
+        initiative = getattr(entity, "speed", 0)
+        self._discard(entity, TURN)
+        self.add(entity, initiative, INTERRUPT)
+        return True
+
+    def react(self, entity):
+        """
+        Queues a reaction for entity, acted out before the next regular turn.
+        An entity has at most one pending reaction; reacting again replaces it.
+        """
+        self.add(entity, getattr(entity, "speed", 0), REACTION)
+
+    def next_actor(self):
+        """
+        Pops the next live entry.
+        Returns (entity, kind) with kind "turn", "interrupt" or "reaction",
+        or None once nobody is left to act this round.
+        """
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            tier, _, _, entity = entry
+            if entity is None:
+                self.stale -= 1
+                continue
+            del self.entries[(entity, tier)]
+            return entity, TURN_KINDS[tier]
+        return None
+
+    def peek(self):
+        """Returns the entity that would act next without removing it."""
+        while self.heap and self.heap[0][3] is None:
+            heapq.heappop(self.heap)
+            self.stale -= 1
+        return self.heap[0][3] if self.heap else None
+
+    def _discard(self, entity, tier):
+        entry = self.entries.pop((entity, tier), None)
+        if entry is not None:
+            entry[3] = None
+            self.stale += 1
+            if self.stale > len(self.entries):
+                self._compact()
+
+    def _compact(self):
+        self.heap = [entry for entry in self.heap if entry[3] is not None]
+        heapq.heapify(self.heap)
+        self.stale = 0
+
+
 class RoundSystem:
     def __init__(self):
         self.round_number = 1
+        self.scheduler = InitiativeScheduler()
+        self.current_actor = None
 
-    def start_round(self, player):
-        player.ap = player.max_ap
-        # ...existing code...
+    def start_round(self, entities):
+        """Refreshes AP for every entity and queues their turns by speed."""
+        entities = list(entities)
+        # One pass over the roster per round; per-turn work stays O(log n)
+        for entity in entities:
+            entity.ap = entity.max_ap
+        self.scheduler.reset(entities)
+        self.current_actor = None
+
+    def next_turn(self):
+        """
+        Advances to the next actor.
+        Returns (entity, kind) or None when the round is over.
+        """
+        turn = self.scheduler.next_actor()
+        self.current_actor = turn[0] if turn else None
+        return turn
 
     def calculate_move_cost(self, distance):
         """
@@ -5,6 +5,8 @@ from pathlib import Path
 import tempfile
 import shutil
 from threading import Lock
+from .importer import BackgroundImporter
+from .inventory import item_registry
 
 class ConfigManager:
     """Manages atomic writes and reads to config files"""
@@ -83,7 +85,8 @@ class ConfigManager:
         """Return default config structure"""
         defaults = {
             "world": {"width": 40, "height": 25},
-            "characters": {"player": {"max_ap": 100, "current_ap": 100}}
+            "characters": {"player": {"max_ap": 100, "current_ap": 100}},
+            "items": {"items": []}
         }
         return defaults.get(config_type, {})
 
@@ -106,6 +109,14 @@ def load_world_config(json_path):
 def load_actor_config(json_path):
     return config_manager.load_config('characters')
 
+def load_item_config(json_path):
+    return config_manager.load_config('items')
+
+def load_item_registry(json_path, registry=None):
+    """Loads the item definitions into the registry (the global item_registry by default)."""
+    registry = registry if registry is not None else item_registry
+    return registry.load_items(load_item_config(json_path).get("items", []))
+
 def save_actor_config(json_path, data):
     """Save updated character data back to config file"""
     config_manager.save_config('characters', data, force=True)
@@ -116,11 +127,39 @@ def update_character_data(actor_cfg, player):
         "current_ap": player.ap,
         "max_ap": player.max_ap,
         "speed": player.speed,
+        "inventory": player.inventory.to_dict(),
         "last_update": time.time()
     })
     save_character_state(actor_cfg)
     return actor_cfg
 
-def load_data_from_db_or_http_or_llm(source):
-    # Stub for DB, HTTP, or LLM-based data import
-    return {}
\ No newline at end of file
+# Scenarios imported from DB/HTTP/LLM sources: one long-lived importer (and
+# so one connection pool and cache) per source, so the same id from two
+# sources (and its ETag) never mixes and keep-alive connections are reused
+scenario_importers = {}
+_importers_lock = Lock()
+
+def get_scenario_importer(source):
+    """Returns the shared BackgroundImporter for source, creating it on first use."""
+    with _importers_lock:
+        importer = scenario_importers.get(source)
+        if importer is None:
+            importer = scenario_importers[source] = BackgroundImporter(source)
+        return importer
+
+def close_scenario_importers():
+    """Closes every shared importer and its connections, e.g. on shutdown."""
+    with _importers_lock:
+        importers = list(scenario_importers.values())
+        scenario_importers.clear()
+    for importer in importers:
+        importer.close()
+
+def load_data_from_db_or_http_or_llm(source, scenario_id):
+    """
+    Import a scenario from a DB, HTTP or LLM source (see importer.adapter_for:
+    an http(s):// base URL, a sqlite:/// path, a directory of JSON files or a
+    callable such as an LLM generator). Blocks until loaded; use
+    BackgroundImporter to prefetch from inside the game loop instead.
+    """
+    return get_scenario_importer(source).get(scenario_id)
\ No newline at end of file
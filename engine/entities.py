@@ -1,5 +1,6 @@
 import pygame
 from .config import TILE_WIDTH, TILE_HEIGHT
+from .inventory import Inventory
 
 class Entity:
     def __init__(self, x, y, z=0):
@@ -9,10 +10,13 @@ class Entity:
         self.char = "@"  # ASCII symbol for demonstration
         self.color = (255, 255, 0)  # Bright yellow for better visibility
         self.axis = (x, y, z)  # storing axes in a tuple
-        self.inventory = []    # placeholder for inventory
+        self.entity_id = None  # assigned by Playfield.add_entity
+        self.inventory = Inventory()  # item ids and counts, see inventory.py
         self.max_health = 100
         self.current_health = self.max_health
         self.falling_multiplier = 10  # damage per z-level beyond safe distance
+        self.armor = 0  # flat damage reduction per hit
+        self.status_flags = 0  # bit flags from resolution.STATUS_FLAGS
 
     def update(self, world):
         """
@@ -41,6 +45,7 @@ class Entity:
         self.x = new_x
         self.y = new_y
         self.z = target_z
+        playfield.entity_moved(self)
         return True
 
     def take_damage(self, amount):
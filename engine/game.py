@@ -5,10 +5,15 @@ from .entities import Entity
 from .config import *
 from .config_loader import load_world_config  # Add this import
 from .combat import RoundSystem
+from .pathfinding import HierarchicalPathfinder
+from .schema import validate_characters
 from .Interface import (
     draw_round_and_turn, draw_move_route, draw_route_info, draw_player_stats
 )
-from .config_loader import load_actor_config, save_actor_config, update_character_data
+from .config_loader import (
+    load_actor_config, save_actor_config, update_character_data, load_item_registry
+)
+from .inventory import Inventory
 
 class Game:
     def __init__(self):
@@ -23,28 +28,31 @@ class Game:
 
         # Load config and initialize playfield - Fix the order and usage
         self.playfield = Playfield(1, 1)
-        self.playfield.init_from_config("c:/CodingProjects/Games/RPGEngine/world_config.json")
-        
-        # Now get the config after it's been loaded
-        self.config = load_world_config("c:/CodingProjects/Games/RPGEngine/world_config.json")
-
-        # Get player position from config
-        player_start = self.config.get("player_start", {"x": 15, "y": 10, "z": 0})
-        self.player = Entity(
-            player_start.get("x", 15),
-            player_start.get("y", 10),
-            player_start.get("z", 0)
+        # The validated config, so player_start matches the map that was built
+        self.config = self.playfield.init_from_config(
+            "c:/CodingProjects/Games/RPGEngine/world_config.json"
         )
+
+        # Item definitions must be registered before any inventory is filled
+        load_item_registry("c:/CodingProjects/Games/RPGEngine/items_config.json")
+
+        # Get player position from config (defaults filled in by the schema)
+        player_start = self.config["player_start"]
+        self.player = Entity(player_start["x"], player_start["y"], player_start["z"])
         self.playfield.add_entity(self.player)
+        self.pathfinder = HierarchicalPathfinder(self.playfield)
         self.pressed_keys = set()  # Track currently pressed keys
 
         self.config_path = "c:/CodingProjects/Games/RPGEngine/characters_config.json"
-        actor_cfg = load_actor_config(self.config_path)
+        # Validated like scenarios, so a bad file fails here with every problem listed
+        self.actor_cfg = validate_characters(load_actor_config(self.config_path))
         self.round_system = RoundSystem()
-        # Initialize player stats
-        self.player.speed = actor_cfg["player"]["speed"]
-        self.player.max_ap = actor_cfg["player"]["max_ap"]
-        self.player.ap = actor_cfg["player"]["current_ap"]
+        # Initialize player stats (defaults filled in by the schema)
+        player_cfg = self.actor_cfg["player"]
+        self.player.speed = player_cfg["speed"]
+        self.player.max_ap = player_cfg["max_ap"]
+        self.player.ap = player_cfg["current_ap"]
+        self.player.inventory = Inventory.from_dict(player_cfg.get("inventory", {}))
 
         self.planned_route = []
 
@@ -123,8 +131,8 @@ class Game:
                                 self.round_system.end_round(world_state, character_state)
                             self.planned_route.clear()
                         else:
-                            # Compute a simple path (straight line for demonstration)
-                            self.planned_route = self._compute_route_simple(
+                            # Plan a route around walls and unclimbable slopes
+                            self.planned_route = self.pathfinder.find_path(
                                 (self.player.x, self.player.y),
                                 (tile_x, tile_y)
                             )
@@ -0,0 +1,399 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote, urlsplit
+
+from .schema import validate_scenario
+
+# Status values returned by SourceAdapter.fetch
+FETCHED = "fetched"
+NOT_MODIFIED = "not_modified"
+
+
+# ---------------------------------------------------------------------
+# HTTP client
+# ---------------------------------------------------------------------
+class HTTPConnectionPool:
+    """
+    Minimal asyncio HTTP/1.1 client that keeps connections to one host
+    alive and reuses them, with at most max_connections open at a time.
+    """
+    def __init__(self, host, port, use_ssl=False, max_connections=10, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if use_ssl else None
+        self.timeout = timeout
+        self.idle = []
+        self.limit = asyncio.Semaphore(max_connections)
+
+    async def _connect(self):
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+        )
+
+    async def request(self, method, path, headers=None):
+        """Returns (status, headers, body) with lower-cased header names."""
+        async with self.limit:
+            if self.idle:
+                try:
+                    return await self._exchange(self.idle.pop(), method, path, headers or {})
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    pass  # the server closed an idle keep-alive connection; reconnect
+            return await self._exchange(await self._connect(), method, path, headers or {})
+
+    async def _exchange(self, conn, method, path, headers):
+        try:
+            response = await asyncio.wait_for(self._send(conn, method, path, headers), self.timeout)
+        except BaseException:
+            conn[1].close()
+            raise
+        if response[1].get("connection", "").lower() == "close":
+            conn[1].close()
+        else:
+            self.idle.append(conn)
+        return response
+
+    async def _send(self, conn, method, path, headers):
+        reader, writer = conn
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", "Connection: keep-alive"]
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        if status in (204, 304) or method == "HEAD":
+            body = b""
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in response_headers:
+            body = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await reader.read()
+            response_headers["connection"] = "close"
+        return status, response_headers, body
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+
+# ---------------------------------------------------------------------
+# Source adapters
+# ---------------------------------------------------------------------
+class SourceAdapter:
+    """
+    Base class for scenario sources.
+    fetch() returns (FETCHED, data, validator) or (NOT_MODIFIED, None, validator),
+    where validator is an opaque version tag (ETag, mtime, row version...)
+    that is passed back on the next fetch for conditional revalidation.
+    """
+    async def fetch(self, scenario_id, validator=None):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class HTTPSourceAdapter(SourceAdapter):
+    """GETs {base_url}/{scenario_id} through a pooled keep-alive client."""
+    def __init__(self, base_url, max_connections=10, timeout=10.0):
+        parts = urlsplit(base_url)
+        use_ssl = parts.scheme == "https"
+        self.path = parts.path.rstrip("/")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if use_ssl else 80)
+        self.use_ssl = use_ssl
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.pool = None
+
+    async def fetch(self, scenario_id, validator=None):
+        if self.pool is None:
+            # Created lazily so the pool binds to the loop that uses it
+            self.pool = HTTPConnectionPool(self.host, self.port, self.use_ssl,
+                                           self.max_connections, self.timeout)
+        headers = {"Accept": "application/json"}
+        if validator:
+            headers["If-None-Match"] = validator
+        # Quote everything, so ids can't add path segments or inject headers
+        path = f"{self.path}/{quote(scenario_id, safe='')}"
+        status, response_headers, body = await self.pool.request("GET", path, headers)
+        if status == 304:
+            return NOT_MODIFIED, None, validator
+        if status != 200:
+            raise IOError(f"GET {path} returned HTTP {status}")
+        return FETCHED, json.loads(body), response_headers.get("etag")
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+
+
+class FileSourceAdapter(SourceAdapter):
+    """Reads {directory}/{scenario_id}.json; the file's mtime is the validator."""
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _read(self, scenario_id, validator):
+        path = os.path.join(self.directory, f"{scenario_id}.json")
+        mtime = str(os.stat(path).st_mtime_ns)
+        if mtime == validator:
+            return NOT_MODIFIED, None, validator
+        with open(path, "r") as f:
+            return FETCHED, json.load(f), mtime
+
+    async def fetch(self, scenario_id, validator=None):
+        return await asyncio.to_thread(self._read, scenario_id, validator)
+
+
+class SQLiteSourceAdapter(SourceAdapter):
+    """
+    Reads scenarios from a SQLite table:
+        CREATE TABLE scenarios (id TEXT PRIMARY KEY, data TEXT, version TEXT)
+    The version column is the validator.
+    """
+    def __init__(self, db_path, table="scenarios"):
+        self.db_path = db_path
+        self.table = table
+
+    def _read(self, scenario_id, validator):
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT version FROM {self.table} WHERE id = ?", (scenario_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"scenario {scenario_id!r} not found")
+            if validator is not None and row[0] == validator:
+                return NOT_MODIFIED, None, validator
+            data, version = conn.execute(
+                f"SELECT data, version FROM {self.table} WHERE id = ?", (scenario_id,)
+            ).fetchone()
+        return FETCHED, json.loads(data), version
+
+    async def fetch(self, scenario_id, validator=None):
+        return await asyncio.to_thread(self._read, scenario_id, validator)
+
+
+class CallableSourceAdapter(SourceAdapter):
+    """
+    Wraps any function returning a scenario dict, e.g. an LLM generator.
+    Sync functions run in a worker thread. There is no validator, so
+    results are only refreshed once their cache entry expires.
+    """
+    def __init__(self, func):
+        self.func = func
+
+    async def fetch(self, scenario_id, validator=None):
+        if asyncio.iscoroutinefunction(self.func):
+            data = await self.func(scenario_id)
+        else:
+            data = await asyncio.to_thread(self.func, scenario_id)
+        return FETCHED, data, None
+
+
+def adapter_for(source):
+    """Builds an adapter from an adapter, callable, URL, sqlite:/// URL or directory."""
+    if isinstance(source, SourceAdapter):
+        return source
+    if callable(source):
+        return CallableSourceAdapter(source)
+    if source.startswith(("http://", "https://")):
+        return HTTPSourceAdapter(source)
+    if source.startswith("sqlite:///"):
+        return SQLiteSourceAdapter(source[len("sqlite:///"):])
+    return FileSourceAdapter(source)
+
+
+# ---------------------------------------------------------------------
+# Cache and pipeline
+# ---------------------------------------------------------------------
+class ScenarioCache:
+    """
+    LRU cache of validated scenarios keyed by scenario id.
+    Entries older than ttl seconds are stale: they are still returned by
+    get_stale() but get() treats them as misses so they are revalidated.
+    Lookups return a deep copy, so a caller mutating its scenario (e.g. a
+    playfield normalizing it) can't change what other callers get.
+    """
+    def __init__(self, max_entries=128, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # id -> [data, validator, fetched_at]
+        self.lock = threading.Lock()
+
+    def get(self, scenario_id):
+        """Returns fresh data or None."""
+        with self.lock:
+            entry = self.entries.get(scenario_id)
+            if entry is None or time.monotonic() - entry[2] > self.ttl:
+                return None
+            self.entries.move_to_end(scenario_id)
+            return copy.deepcopy(entry[0])
+
+    def get_stale(self, scenario_id):
+        """Returns (data, validator) even if expired, or (None, None)."""
+        with self.lock:
+            entry = self.entries.get(scenario_id)
+            if entry is None:
+                return None, None
+            self.entries.move_to_end(scenario_id)
+            return copy.deepcopy(entry[0]), entry[1]
+
+    def put(self, scenario_id, data, validator):
+        """Stores data as is; the caller must not mutate it afterwards."""
+        with self.lock:
+            self.entries[scenario_id] = [data, validator, time.monotonic()]
+            self.entries.move_to_end(scenario_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def touch(self, scenario_id):
+        """Marks an entry fresh again after a successful revalidation."""
+        with self.lock:
+            entry = self.entries.get(scenario_id)
+            if entry is not None:
+                entry[2] = time.monotonic()
+                self.entries.move_to_end(scenario_id)
+
+
+class ScenarioImporter:
+    """
+    Async import pipeline: cache lookup, conditional fetch through a source
+    adapter, validation in a worker thread, cache store.
+    Concurrent requests for the same scenario share one fetch, but each
+    caller gets its own copy of the result.
+    """
+    def __init__(self, source, cache=None, validate=validate_scenario, max_concurrency=8):
+        self.adapter = adapter_for(source)
+        self.cache = cache if cache is not None else ScenarioCache()
+        self.validate = validate
+        self.max_concurrency = max_concurrency
+        self.limit = None
+        self.in_flight = {}
+
+    async def get(self, scenario_id):
+        """Returns the validated scenario, fetching or revalidating if needed."""
+        data = self.cache.get(scenario_id)
+        if data is not None:
+            return data
+        task = self.in_flight.get(scenario_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(scenario_id))
+            self.in_flight[scenario_id] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(scenario_id, None))
+        return copy.deepcopy(await task)
+
+    async def _load(self, scenario_id):
+        if self.limit is None:
+            self.limit = asyncio.Semaphore(self.max_concurrency)
+        stale, validator = self.cache.get_stale(scenario_id)
+        async with self.limit:
+            status, data, validator = await self.adapter.fetch(
+                scenario_id, validator if stale is not None else None
+            )
+        if status == NOT_MODIFIED:
+            self.cache.touch(scenario_id)
+            return stale
+        # Validation can be expensive for big scenarios; keep it off the loop
+        data = await asyncio.to_thread(self.validate, data)
+        self.cache.put(scenario_id, data, validator)
+        return data
+
+    async def prefetch(self, scenario_ids):
+        """
+        Loads several scenarios concurrently.
+        Returns {scenario_id: data or exception}; one failure doesn't stop the rest.
+        """
+        ids = list(scenario_ids)
+        results = await asyncio.gather(*(self.get(i) for i in ids), return_exceptions=True)
+        return dict(zip(ids, results))
+
+    async def close(self):
+        await self.adapter.close()
+
+
+class BackgroundImporter:
+    """
+    Runs a ScenarioImporter on its own event loop thread, so the
+    (synchronous) game loop can queue prefetches for upcoming encounters
+    and pick up results without ever blocking on the network.
+    Failed loads are remembered for retry_after seconds, so polling a
+    missing scenario every frame doesn't send a request every frame.
+    """
+    def __init__(self, source, cache=None, retry_after=30.0, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.importer = ScenarioImporter(source, cache, **kwargs)
+        self.retry_after = retry_after
+        self.pending = set()  # ids with a get_cached refresh in flight
+        self.failures = {}    # id -> time.monotonic() after which to retry
+
+    @property
+    def cache(self):
+        return self.importer.cache
+
+    def prefetch(self, scenario_ids):
+        """Queues scenario_ids for loading; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(self.importer.prefetch(scenario_ids), self.loop)
+
+    def get_cached(self, scenario_id):
+        """
+        Returns the cached scenario without waiting (stale data included),
+        or None if it hasn't arrived yet. Stale entries are refreshed in the
+        background.
+        """
+        data = self.cache.get(scenario_id)
+        if data is None:
+            data, _ = self.cache.get_stale(scenario_id)
+            retry_at = self.failures.get(scenario_id)
+            if scenario_id not in self.pending and (retry_at is None or time.monotonic() >= retry_at):
+                self.pending.add(scenario_id)
+                asyncio.run_coroutine_threadsafe(self._refresh(scenario_id), self.loop)
+        return data
+
+    async def _refresh(self, scenario_id):
+        try:
+            await self.importer.get(scenario_id)
+            self.failures.pop(scenario_id, None)
+        except Exception:
+            self.failures[scenario_id] = time.monotonic() + self.retry_after
+        finally:
+            self.pending.discard(scenario_id)
+
+    def get(self, scenario_id, timeout=None):
+        """Blocking fetch, for tools and match setup outside the game loop."""
+        future = asyncio.run_coroutine_threadsafe(self.importer.get(scenario_id), self.loop)
+        return future.result(timeout)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.importer.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -0,0 +1,226 @@
+import sys
+
+ITEM_FIELDS = {
+    # field: (type(s), required, default)
+    "id": (str, True, None),
+    "name": (str, True, None),
+    "category": (str, True, None),
+    "weight": ((int, float), False, 0.0),
+    "value": ((int, float), False, 0),
+    "stackable": (bool, False, True),
+    "max_stack": (int, False, 99),
+    "tags": (list, False, ()),
+}
+
+
+class ItemDefinition:
+    """
+    Shared, read-only description of one item type (flyweight).
+    Inventories only store item ids and counts; every copy of an item
+    refers back to the single definition held by the ItemRegistry.
+    """
+    __slots__ = ("id", "name", "category", "weight", "value", "stackable",
+                 "max_stack", "tags", "data")
+
+    def __init__(self, id, name, category, weight=0.0, value=0, stackable=True,
+                 max_stack=99, tags=(), data=None):
+        self.id = sys.intern(id)
+        self.name = name
+        self.category = sys.intern(category)
+        self.weight = float(weight)
+        self.value = value
+        self.stackable = stackable
+        self.max_stack = max_stack if stackable else 1
+        self.tags = frozenset(sys.intern(tag) for tag in tags)
+        self.data = data or {}  # any extra keys, e.g. "effects"
+
+    def __repr__(self):
+        return f"ItemDefinition({self.id!r})"
+
+
+class ItemRegistry:
+    """
+    Interns item definitions and indexes them by category and tag.
+    """
+    def __init__(self):
+        self.items = {}
+        self.by_category = {}
+        self.by_tag = {}
+
+    def __contains__(self, item_id):
+        return item_id in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, item_id):
+        return self.items[item_id]
+
+    def register(self, definition):
+        """Adds an ItemDefinition, replacing any previous one with the same id."""
+        if definition.id in self.items:
+            self._unindex(self.items[definition.id])
+        self.items[definition.id] = definition
+        self.by_category.setdefault(definition.category, set()).add(definition.id)
+        for tag in definition.tags:
+            self.by_tag.setdefault(tag, set()).add(definition.id)
+        return definition
+
+    def _unindex(self, definition):
+        self.by_category[definition.category].discard(definition.id)
+        for tag in definition.tags:
+            self.by_tag[tag].discard(definition.id)
+
+    def load_items(self, item_dicts):
+        """
+        Validates a whole list of item dicts, then registers them.
+        Nothing is registered if any entry is invalid; the ValueError lists
+        every problem found.
+        """
+        errors = []
+        seen = set()
+        for i, item in enumerate(item_dicts):
+            errors.extend(validate_item(item, f"items[{i}]"))
+            item_id = item.get("id") if isinstance(item, dict) else None
+            if not isinstance(item_id, str):
+                continue  # already reported by validate_item
+            if item_id in seen:
+                errors.append(f"items[{i}].id: duplicate id {item_id!r}")
+            seen.add(item_id)
+        if errors:
+            raise ValueError("Invalid item definitions:\n  " + "\n  ".join(errors))
+
+        for item in item_dicts:
+            fields = {key: item.get(key, spec[2]) for key, spec in ITEM_FIELDS.items()}
+            extra = {key: value for key, value in item.items() if key not in ITEM_FIELDS}
+            self.register(ItemDefinition(data=extra, **fields))
+        return len(item_dicts)
+
+    def ids_in_category(self, category):
+        return self.by_category.get(category, set())
+
+    def ids_with_tag(self, tag):
+        return self.by_tag.get(tag, set())
+
+
+def validate_item(item, path="item"):
+    """Returns a list of error strings for one item dict (empty if valid)."""
+    if not isinstance(item, dict):
+        return [f"{path}: expected an object"]
+    errors = []
+    for key, (types, required, _) in ITEM_FIELDS.items():
+        if key not in item:
+            if required:
+                errors.append(f"{path}.{key}: missing")
+            continue
+        value = item[key]
+        # bool is a subclass of int, don't accept it for numeric fields
+        if not isinstance(value, types) or (isinstance(value, bool) and types is not bool):
+            errors.append(f"{path}.{key}: wrong type {type(value).__name__}")
+    if isinstance(item.get("weight"), (int, float)) and item["weight"] < 0:
+        errors.append(f"{path}.weight: must be >= 0")
+    if isinstance(item.get("max_stack"), int) and item["max_stack"] < 1:
+        errors.append(f"{path}.max_stack: must be >= 1")
+    tags = item.get("tags", [])
+    if isinstance(tags, list) and not all(isinstance(tag, str) for tag in tags):
+        errors.append(f"{path}.tags: must be a list of strings")
+    return errors
+
+
+# Global item registry instance
+item_registry = ItemRegistry()
+
+
+class Inventory:
+    """
+    Compact per-entity inventory: item id -> count.
+    Keeps running indexes so total weight, per-category and per-tag
+    queries don't walk the whole inventory.
+    """
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else item_registry
+        self.counts = {}
+        self.total_weight = 0.0
+        self.total_value = 0
+        self.by_category = {}
+        self.by_tag = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, item_id):
+        return item_id in self.counts
+
+    def count(self, item_id):
+        return self.counts.get(item_id, 0)
+
+    def add(self, item_id, count=1):
+        if count <= 0:
+            return
+        item = self.registry.get(item_id)
+        if item_id not in self.counts:
+            self.counts[item.id] = 0
+            self.by_category.setdefault(item.category, set()).add(item.id)
+            for tag in item.tags:
+                self.by_tag.setdefault(tag, set()).add(item.id)
+        self.counts[item.id] += count
+        self.total_weight += item.weight * count
+        self.total_value += item.value * count
+
+    def remove(self, item_id, count=1):
+        """Removes count copies; returns False (and changes nothing) if there aren't enough."""
+        held = self.counts.get(item_id, 0)
+        if count <= 0 or held < count:
+            return False
+        item = self.registry.get(item_id)
+        if held == count:
+            del self.counts[item_id]
+            self.by_category[item.category].discard(item_id)
+            for tag in item.tags:
+                self.by_tag[tag].discard(item_id)
+        else:
+            self.counts[item_id] = held - count
+        self.total_weight -= item.weight * count
+        self.total_value -= item.value * count
+        if not self.counts:
+            self.total_weight = 0.0  # drop accumulated float error
+        return True
+
+    def items_in_category(self, category):
+        """Returns {item_id: count} for e.g. all "consumable" items."""
+        return {item_id: self.counts[item_id] for item_id in self.by_category.get(category, ())}
+
+    def items_with_tag(self, tag):
+        return {item_id: self.counts[item_id] for item_id in self.by_tag.get(tag, ())}
+
+    def stacks(self):
+        """Yields (item_id, count) per inventory slot, splitting by max_stack."""
+        for item_id, count in self.counts.items():
+            max_stack = self.registry.get(item_id).max_stack
+            while count > 0:
+                yield item_id, min(count, max_stack)
+                count -= max_stack
+
+    def to_dict(self):
+        return dict(self.counts)
+
+    @classmethod
+    def from_dict(cls, counts, registry=None):
+        """
+        Builds an inventory from {item_id: count}, as stored in
+        characters_config.json. Unknown ids or bad counts raise ValueError.
+        """
+        inventory = cls(registry)
+        errors = [
+            f"{item_id}: unknown item" for item_id in counts if item_id not in inventory.registry
+        ]
+        errors.extend(
+            f"{item_id}: count must be a positive integer"
+            for item_id, count in counts.items()
+            if not isinstance(count, int) or isinstance(count, bool) or count <= 0
+        )
+        if errors:
+            raise ValueError("Invalid inventory:\n  " + "\n  ".join(errors))
+        for item_id, count in counts.items():
+            inventory.add(item_id, count)
+        return inventory
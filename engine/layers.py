@@ -1,24 +1,103 @@
+import numpy as np
+
+
 class Layer:
     """
     Represents a single layer of the map.
-    Each cell in this layer has an integer tile ID referencing ASCII_TILESET.
+    Each cell in this layer has an integer tile ID referencing ASCII_TILESET
+    and a height (z). Both are kept as row lists indexed [y][x]; get_tile
+    returns them as a {"id", "z"} dict.
     """
     def __init__(self, width, height, fill_tile=0):
         self.width = width
         self.height = height
-        self.tiles = [
-            [{"id": fill_tile, "z": 0} for _ in range(width)]
-            for _ in range(height)
-        ]
+        self.ids = [[fill_tile] * width for _ in range(height)]
+        self.heights = [[0] * width for _ in range(height)]
+        self.listeners = []
+
+    @classmethod
+    def from_arrays(cls, ids, heights):
+        """
+        Builds a layer from 2D tile id and height arrays (NumPy or nested lists),
+        indexed [y][x], as produced by the terrain generator.
+        """
+        layer = cls.__new__(cls)
+        layer.ids = ids.tolist() if hasattr(ids, "tolist") else [list(row) for row in ids]
+        layer.heights = (heights.tolist() if hasattr(heights, "tolist")
+                         else [list(row) for row in heights])
+        layer.height = len(layer.ids)
+        layer.width = len(layer.ids[0]) if layer.ids else 0
+        layer.listeners = []
+        return layer
 
     def get_tile(self, x, y):
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.tiles[y][x]
+            return {"id": self.ids[y][x], "z": self.heights[y][x]}
         return {"id": 0, "z": 0}
 
     def set_tile(self, x, y, tile_id, z=0):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.tiles[y][x] = {"id": tile_id, "z": z}
+            self.ids[y][x] = tile_id
+            self.heights[y][x] = z
+            for listener in self.listeners:
+                listener(x, y)
+
+    def add_listener(self, callback):
+        """Registers callback(x, y), called whenever set_tile changes a cell."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def get_z(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.heights[y][x]
+        return 0
+
+    def to_arrays(self):
+        """Returns (ids, heights) as int16 arrays indexed [y, x]."""
+        ids = np.array(self.ids, dtype=np.int16)
+        heights = np.array(self.heights, dtype=np.int16)
+        return ids.reshape(self.height, self.width), heights.reshape(self.height, self.width)
+
+
+class SharedLayer(Layer):
+    """
+    Layer backed by read-only tile id and height arrays, typically views
+    into shared memory published by a TerrainStore. Many matches can use
+    the same base arrays; set_tile writes go to a per-layer overlay
+    (copy-on-write), so destructible terrain never touches the shared grid.
+    """
+    def __init__(self, ids, heights, owner=None):
+        self.height, self.width = ids.shape
+        self.ids = ids
+        self.heights = heights
+        self.owner = owner  # keeps the SharedTerrain (and its mapping) alive
+        self.overlay = {}  # (x, y) -> {"id", "z"} for tiles changed in this match
+        self.listeners = []
+
+    def get_tile(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            tile = self.overlay.get((x, y))
+            if tile is None:
+                tile = {"id": int(self.ids[y, x]), "z": int(self.heights[y, x])}
+            return tile
+        return {"id": 0, "z": 0}
+
+    def set_tile(self, x, y, tile_id, z=0):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.overlay[(x, y)] = {"id": tile_id, "z": z}
+            for listener in self.listeners:
+                listener(x, y)
 
     def get_z(self, x, y):
         return self.get_tile(x, y)["z"]
+
+    def to_arrays(self):
+        ids = self.ids.copy()
+        heights = self.heights.copy()
+        for (x, y), tile in self.overlay.items():
+            ids[y, x] = tile["id"]
+            heights[y, x] = tile["z"]
+        return ids, heights
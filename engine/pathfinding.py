@@ -0,0 +1,414 @@
+import heapq
+
+import numpy as np
+
+from .terrain import BLOCKING_TILES, MAX_CLIMB
+
+# Border runs shorter than this get a single transition in the middle,
+# longer runs get one at each end.
+MAX_SINGLE_ENTRANCE_RUN = 6
+
+
+class NavGrid:
+    """
+    Flat navigation view of a Playfield: per-cell height (highest z over all
+    layers, as used by Entity.move_to) and whether the cell is blocked.
+    Cells are addressed by index = y * width + x.
+    """
+    def __init__(self, playfield):
+        self.width = playfield.width
+        self.height = playfield.height
+        self.layers = playfield.layers
+        size = self.width * self.height
+        if not self.layers:
+            self.heights = [0] * size
+            self.blocked = bytearray(size)
+            return
+        arrays = [layer.to_arrays() for layer in self.layers]
+        heights = np.maximum.reduce([layer_heights for _, layer_heights in arrays])
+        blocked = np.logical_or.reduce([np.isin(ids, BLOCKING_TILES) for ids, _ in arrays])
+        # Plain lists index faster than NumPy arrays in the per-cell search loops
+        self.heights = heights.ravel().tolist()
+        self.blocked = bytearray(blocked.ravel().astype(np.uint8).tobytes())
+
+    def refresh_cell(self, x, y):
+        tiles = [layer.get_tile(x, y) for layer in self.layers]
+        index = y * self.width + x
+        self.heights[index] = max((tile["z"] for tile in tiles), default=0)
+        self.blocked[index] = any(tile["id"] in BLOCKING_TILES for tile in tiles)
+
+    def can_step(self, a, b):
+        """Whether an entity on cell a may move onto the adjacent cell b."""
+        return not self.blocked[b] and self.heights[b] - self.heights[a] <= MAX_CLIMB
+
+    def neighbours(self, index, bounds):
+        """Adjacent cells reachable from index, limited to bounds (x0, y0, x1, y1)."""
+        x0, y0, x1, y1 = bounds
+        width = self.width
+        x = index % width
+        y = index // width
+        if x > x0:
+            yield index - 1
+        if x < x1 - 1:
+            yield index + 1
+        if y > y0:
+            yield index - width
+        if y < y1 - 1:
+            yield index + width
+
+
+def grid_search(grid, start, goals, bounds=None, reverse=False):
+    """
+    Dijkstra over the grid from start, restricted to bounds.
+    goals is a set of cell indices; the search stops once all are reached.
+    With reverse=True edges are followed backwards, giving the cost from
+    each goal to start.
+    Returns {goal: cost} for every goal that was reached.
+    """
+    if bounds is None:
+        bounds = (0, 0, grid.width, grid.height)
+    remaining = set(goals)
+    found = {}
+    dist = {start: 0}
+    heap = [(0, start)]
+    can_step = grid.can_step
+    while heap and remaining:
+        cost, current = heapq.heappop(heap)
+        if cost > dist[current]:
+            continue
+        if current in remaining:
+            remaining.discard(current)
+            found[current] = cost
+        for nxt in grid.neighbours(current, bounds):
+            if not (can_step(nxt, current) if reverse else can_step(current, nxt)):
+                continue
+            new_cost = cost + 1
+            if new_cost < dist.get(nxt, new_cost + 1):
+                dist[nxt] = new_cost
+                heapq.heappush(heap, (new_cost, nxt))
+    return found
+
+
+def grid_astar(grid, start, goal, bounds=None):
+    """
+    A* over the grid from start to goal, restricted to bounds.
+    Returns the list of cell indices from start to goal, or None.
+    """
+    if bounds is None:
+        bounds = (0, 0, grid.width, grid.height)
+    width = grid.width
+    gx, gy = goal % width, goal // width
+    came_from = {start: None}
+    dist = {start: 0}
+    heap = [(abs(start % width - gx) + abs(start // width - gy), 0, start)]
+    can_step = grid.can_step
+    while heap:
+        _, cost, current = heapq.heappop(heap)
+        if current == goal:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = came_from[current]
+            path.reverse()
+            return path
+        if cost > dist[current]:
+            continue
+        for nxt in grid.neighbours(current, bounds):
+            if not can_step(current, nxt):
+                continue
+            new_cost = cost + 1
+            if new_cost < dist.get(nxt, new_cost + 1):
+                dist[nxt] = new_cost
+                came_from[nxt] = current
+                estimate = new_cost + abs(nxt % width - gx) + abs(nxt // width - gy)
+                heapq.heappush(heap, (estimate, new_cost, nxt))
+    return None
+
+
+class HierarchicalPathfinder:
+    """
+    HPA* over a Playfield.
+
+    The map is split into cluster_size x cluster_size clusters. Transitions
+    (pairs of adjacent cells on either side of a cluster border) are found
+    up front; the costs between transitions inside a cluster are computed
+    the first time a search needs them and cached. When Layer.set_tile
+    changes a cell, only that cluster's borders are rebuilt and only the
+    affected clusters' cached costs are dropped.
+    """
+    def __init__(self, playfield, cluster_size=16):
+        self.playfield = playfield
+        self.cluster_size = cluster_size
+        self.grid = NavGrid(playfield)
+        self.clusters_x = -(-self.grid.width // cluster_size)
+        self.clusters_y = -(-self.grid.height // cluster_size)
+
+        self.borders = {}      # border key -> [(a, b), ...] transition pairs
+        self.transitions = {}  # cell -> set of cells it can step to across a border
+        self.intra_edges = {}  # cluster -> {cell: [(cell, cost), ...]}
+        self.segments = {}     # cluster -> {(cell, cell): refined path}
+        self.dirty = set()
+
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self._build_border(("h", cx, cy))
+                if cy + 1 < self.clusters_y:
+                    self._build_border(("v", cx, cy))
+
+        for layer in playfield.layers:
+            layer.add_listener(self.on_tile_changed)
+
+    # -----------------------------------------------------------------
+    # Cluster bookkeeping
+    # -----------------------------------------------------------------
+    def cluster_of(self, index):
+        width = self.grid.width
+        return (index % width // self.cluster_size, index // width // self.cluster_size)
+
+    def cluster_bounds(self, cluster):
+        cx, cy = cluster
+        size = self.cluster_size
+        return (
+            cx * size,
+            cy * size,
+            min((cx + 1) * size, self.grid.width),
+            min((cy + 1) * size, self.grid.height)
+        )
+
+    def _cluster_borders(self, cluster):
+        cx, cy = cluster
+        keys = []
+        if cx + 1 < self.clusters_x:
+            keys.append(("h", cx, cy))
+        if cx > 0:
+            keys.append(("h", cx - 1, cy))
+        if cy + 1 < self.clusters_y:
+            keys.append(("v", cx, cy))
+        if cy > 0:
+            keys.append(("v", cx, cy - 1))
+        return keys
+
+    def _cluster_nodes(self, cluster):
+        nodes = set()
+        for key in self._cluster_borders(cluster):
+            for a, b in self.borders.get(key, ()):
+                nodes.add(a if self.cluster_of(a) == cluster else b)
+        return nodes
+
+    def _build_border(self, key):
+        """
+        Finds the transitions across one border and records them.
+
+        The border is split into runs of pairs that can be crossed in the
+        same direction(s) and whose cells can step to their neighbours along
+        the border both ways, so any crossing in a run can be replaced by
+        the run's transition without losing reachability.
+        """
+        for a, b in self.borders.pop(key, ()):
+            self.transitions[a].discard(b)
+            self.transitions[b].discard(a)
+
+        grid = self.grid
+        can_step = grid.can_step
+        width = grid.width
+        kind, cx, cy = key
+        x0, y0, x1, y1 = self.cluster_bounds((cx, cy))
+        if kind == "h":
+            # Cells in the last column of (cx, cy) and the first of (cx + 1, cy)
+            cells = [(y * width + x1 - 1, y * width + x1) for y in range(y0, y1)]
+        else:
+            # Cells in the last row of (cx, cy) and the first of (cx, cy + 1)
+            cells = [((y1 - 1) * width + x, y1 * width + x) for x in range(x0, x1)]
+
+        def mutual(p, q):
+            return can_step(p, q) and can_step(q, p)
+
+        pairs = []
+        run = []
+        run_dirs = None
+        for a, b in cells + [(None, None)]:
+            dirs = None
+            if a is not None and not grid.blocked[a] and not grid.blocked[b]:
+                dirs = (can_step(a, b), can_step(b, a))
+                if dirs == (False, False):
+                    dirs = None
+            if run and (dirs != run_dirs or not mutual(run[-1][0], a) or not mutual(run[-1][1], b)):
+                if len(run) < MAX_SINGLE_ENTRANCE_RUN:
+                    pairs.append(run[len(run) // 2])
+                else:
+                    pairs.append(run[0])
+                    pairs.append(run[-1])
+                run = []
+            if dirs is not None:
+                run.append((a, b))
+                run_dirs = dirs
+
+        self.borders[key] = pairs
+        for a, b in pairs:
+            # Transitions are directed: only the steppable direction(s)
+            self.transitions.setdefault(a, set())
+            self.transitions.setdefault(b, set())
+            if can_step(a, b):
+                self.transitions[a].add(b)
+            if can_step(b, a):
+                self.transitions[b].add(a)
+
+    def _intra(self, cluster):
+        """Cached transition-to-transition costs inside one cluster."""
+        edges = self.intra_edges.get(cluster)
+        if edges is None:
+            bounds = self.cluster_bounds(cluster)
+            nodes = self._cluster_nodes(cluster)
+            edges = {}
+            for node in nodes:
+                costs = grid_search(self.grid, node, nodes - {node}, bounds)
+                edges[node] = list(costs.items())
+            self.intra_edges[cluster] = edges
+        return edges
+
+    def build_abstract_graph(self):
+        """Computes every cluster's transition costs up front (e.g. at match start)."""
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self._intra((cx, cy))
+
+    def close(self):
+        """Stops listening for tile changes; call when the pathfinder is replaced."""
+        for layer in self.playfield.layers:
+            layer.remove_listener(self.on_tile_changed)
+
+    def on_tile_changed(self, x, y):
+        """Layer listener: refresh the cell and mark its cluster for repair."""
+        self.grid.refresh_cell(x, y)
+        self.dirty.add(self.cluster_of(y * self.grid.width + x))
+
+    def repair(self):
+        """Rebuilds the borders of changed clusters and drops stale costs."""
+        for cluster in self.dirty:
+            for key in self._cluster_borders(cluster):
+                self._build_border(key)
+            cx, cy = cluster
+            for neighbour in (cluster, (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                self.intra_edges.pop(neighbour, None)
+                self.segments.pop(neighbour, None)
+        self.dirty.clear()
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+    def find_path(self, start, goal):
+        """
+        Returns the list of (x, y) tiles from start to goal (both included),
+        or an empty list if goal cannot be reached.
+        """
+        return list(self.iter_path(start, goal))
+
+    def iter_path(self, start, goal):
+        """
+        Like find_path, but yields (x, y) tiles as they are refined, so a
+        caller that only needs the next few steps never refines the rest.
+        """
+        width = self.grid.width
+        for index in self._plan(start, goal):
+            yield (index % width, index // width)
+
+    def _plan(self, start, goal):
+        """Returns an iterable of cell indices from start to goal (empty if unreachable)."""
+        grid = self.grid
+        width = grid.width
+        (sx, sy), (gx, gy) = start, goal
+        if not (0 <= sx < width and 0 <= sy < grid.height and
+                0 <= gx < width and 0 <= gy < grid.height):
+            return []
+        if self.dirty:
+            self.repair()
+
+        s = sy * width + sx
+        g = gy * width + gx
+        if s == g:
+            return [s]
+
+        start_cluster = self.cluster_of(s)
+        goal_cluster = self.cluster_of(g)
+        if (abs(start_cluster[0] - goal_cluster[0]) <= 1 and
+                abs(start_cluster[1] - goal_cluster[1]) <= 1):
+            # Short hops: a search over the (at most 2x2) clusters involved is
+            # cheap and avoids detours through distant transitions
+            sb, gb = self.cluster_bounds(start_cluster), self.cluster_bounds(goal_cluster)
+            bounds = (min(sb[0], gb[0]), min(sb[1], gb[1]), max(sb[2], gb[2]), max(sb[3], gb[3]))
+            local = grid_astar(grid, s, g, bounds)
+            if local:
+                return local
+
+        abstract = self._abstract_search(s, g, start_cluster, goal_cluster)
+        if abstract is None:
+            return []
+        return self._refine(abstract)
+
+    def _abstract_search(self, s, g, start_cluster, goal_cluster):
+        """A* over the transition graph with start and goal inserted."""
+        width = self.grid.width
+        start_nodes = self._cluster_nodes(start_cluster)
+        start_edges = grid_search(self.grid, s, start_nodes, self.cluster_bounds(start_cluster))
+        goal_nodes = self._cluster_nodes(goal_cluster)
+        to_goal = grid_search(self.grid, g, goal_nodes, self.cluster_bounds(goal_cluster), reverse=True)
+        if not start_edges or not to_goal:
+            return None
+
+        gx, gy = g % width, g // width
+        came_from = {s: None}
+        dist = {s: 0}
+        heap = [(0, 0, s)]
+        while heap:
+            _, cost, current = heapq.heappop(heap)
+            if current == g:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path
+            if cost > dist[current]:
+                continue
+
+            if current == s:
+                edges = list(start_edges.items())
+            else:
+                edges = list(self._intra(self.cluster_of(current)).get(current, ()))
+            for other in self.transitions.get(current, ()):
+                edges.append((other, 1))
+            if current in to_goal:
+                edges.append((g, to_goal[current]))
+
+            for nxt, step in edges:
+                new_cost = cost + step
+                if new_cost < dist.get(nxt, new_cost + 1):
+                    dist[nxt] = new_cost
+                    came_from[nxt] = current
+                    estimate = new_cost + abs(nxt % width - gx) + abs(nxt // width - gy)
+                    heapq.heappush(heap, (estimate, new_cost, nxt))
+        return None
+
+    def _refine(self, abstract):
+        """
+        Expands each abstract hop into grid cells, lazily.
+        Hops between two transitions are cached per cluster so repeated
+        queries through the same cluster only pay for the search once.
+        """
+        yield abstract[0]
+        last = len(abstract) - 2
+        for i, (a, b) in enumerate(zip(abstract, abstract[1:])):
+            if b in self.transitions.get(a, ()):
+                yield b
+                continue
+            cluster = self.cluster_of(a)
+            # Hops from the start or to the goal are one-off, don't cache them
+            cacheable = 0 < i < last
+            cache = self.segments.setdefault(cluster, {}) if cacheable else {}
+            segment = cache.get((a, b))
+            if segment is None:
+                segment = grid_astar(self.grid, a, b, self.cluster_bounds(cluster))
+                if cacheable:
+                    cache[(a, b)] = segment
+            yield from segment[1:]
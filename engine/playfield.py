@@ -1,7 +1,9 @@
-import random
 from .config_loader import load_world_config
 from .config import ASCII_TILESET, TILE_WIDTH, TILE_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT
 from .layers import Layer  # Import Layer from layers.py
+from .schema import validate_scenario
+from .terrain_store import attach
+from .terrain import generate_terrain, ensure_connected, place_scattered, make_rng, new_seed
 
 class Playfield:
     """
@@ -13,6 +15,10 @@ class Playfield:
         self.height = height
         self.layers = []
         self.entities = []
+        self.entities_version = 0  # bumped whenever entities are added, removed or moved
+        self.next_entity_id = 1
+        self.seed = None
+        self.terrain = None  # SharedTerrain when attached to a published map
         self._setup_z_colors()
 
     def _setup_z_colors(self):
@@ -42,58 +48,104 @@ class Playfield:
     def init_from_config(self, json_config_path):
         """
         Example of initializing the playfield from a JSON config.
+        Random placement is driven by the config's "seed" so every node
+        generates the same map for a match; without one a seed is drawn
+        and kept in self.seed so the map can be reproduced later.
+        A config without width/height keeps this playfield's current size.
+        Returns the validated config, with defaults filled in.
         """
         config = load_world_config(json_config_path)
-        self.width = config.get("width", self.width)
-        self.height = config.get("height", self.height)
-        self.layers.clear()
+        if isinstance(config, dict):
+            config = {"width": self.width, "height": self.height, **config}
+        # Validates and fills in defaults; raises SchemaError on a bad config
+        config = validate_scenario(config)
+        self.width = config["width"]
+        self.height = config["height"]
+        self.seed = config.get("seed")
+        if self.seed is None:
+            self.seed = new_seed()
+        self.detach_terrain()
 
-        for layer_data in config.get("layers", []):
-            fill_tile = layer_data.get("fill_tile", 0)
-            layer = Layer(self.width, self.height, fill_tile=fill_tile)
+        for layer_index, layer_data in enumerate(config["layers"]):
+            rng = make_rng(self.seed, layer_index)
+            fill_tile = layer_data["fill_tile"]
 
-            # Parse random_walls
-            random_walls = layer_data.get("random_walls", 0)
-            wall_count, wall_variance = self._parse_count_variance(random_walls)
-            self._place_random_tiles(layer, wall_count, wall_variance, 1)
+            # Procedural terrain (heightmap, water, clustered walls); connectivity
+            # is enforced once below, after the random tiles are placed
+            terrain_cfg = layer_data["terrain"]
+            ids, heights = generate_terrain(
+                self.width, self.height, dict(terrain_cfg, connected=False), rng, fill_tile
+            )
 
-            # Parse random_mountains
-            random_mtns = layer_data.get("random_mountains", 0)
-            mtn_count, mtn_variance = self._parse_count_variance(random_mtns)
-            self._place_random_tiles(layer, mtn_count, mtn_variance, 4)
+            # random_walls / random_mountains are normalised to {count, variance}
+            walls = layer_data["random_walls"]
+            self._place_random_tiles(ids, rng, walls["count"], walls["variance"], 1)
+
+            mountains = layer_data["random_mountains"]
+            self._place_random_tiles(ids, rng, mountains["count"], mountains["variance"], 4)
+
+            if terrain_cfg.get("connected"):
+                ensure_connected(ids, heights)
+
+            layer = Layer.from_arrays(ids, heights)
 
             # Parse explicit layout with Z values
-            for tile_def in layer_data.get("layout", []):
-                x = tile_def.get("x", 0)
-                y = tile_def.get("y", 0)
-                tile_id = tile_def.get("tile_id", 0)
-                z = tile_def.get("z", 0)
-                layer.set_tile(x, y, tile_id, z)
+            for tile_def in layer_data["layout"]:
+                layer.set_tile(tile_def["x"], tile_def["y"], tile_def["tile_id"], tile_def["z"])
 
             self.layers.append(layer)
+        return config
+
+    def attach_terrain(self, name):
+        """
+        Uses a map published by a TerrainStore (see terrain_store.py) instead
+        of generating one. The layers read the shared grids in place; tiles
+        changed with set_tile only affect this playfield.
+        """
+        self.detach_terrain()
+        self.terrain = attach(name)
+        self.width = self.terrain.width
+        self.height = self.terrain.height
+        self.layers = self.terrain.make_layers()
 
-    def _parse_count_variance(self, val):
+    def detach_terrain(self):
         """
-        Allows random_x to be either a numeric or object { count: X, variance: Y }
-        Returns (count, variance) tuple.
+        Drops the layers of an attached map. The mapping is closed right away
+        if nothing else holds those layers; otherwise it stays open until the
+        last of them (e.g. one kept by a pathfinder) is gone.
         """
-        if isinstance(val, dict):
-            return val.get("count", 0), val.get("variance", 0)
-        return val, 0
+        terrain, self.terrain = self.terrain, None
+        self.layers = []
+        if terrain is not None and not len(terrain.views):
+            terrain.close()
 
-    def _place_random_tiles(self, layer, base_count, variance, tile_id):
+    def _place_random_tiles(self, ids, rng, base_count, variance, tile_id):
         """
-        Places tile_id base_count ± some random variation times.
+        Places tile_id base_count ± some random variation times into the
+        ids grid, in one batch.
         """
-        final_count = base_count + random.randint(-variance, variance) if variance else base_count
+        final_count = base_count + int(rng.integers(-variance, variance + 1)) if variance else base_count
         final_count = max(0, final_count)  # clamp to 0
-        for _ in range(final_count):
-            rx = random.randint(0, self.width - 1)
-            ry = random.randint(0, self.height - 1)
-            layer.set_tile(rx, ry, tile_id)
+        place_scattered(rng, ids, final_count, tile_id)
 
     def add_entity(self, entity):
+        if getattr(entity, "entity_id", None) is None:
+            self.assign_entity_id(entity)
         self.entities.append(entity)
+        self.entities_version += 1
+
+    def assign_entity_id(self, entity):
+        """Gives entity an id that stays the same for as long as it is on this playfield."""
+        entity.entity_id = self.next_entity_id
+        self.next_entity_id += 1
+
+    def remove_entity(self, entity):
+        self.entities.remove(entity)
+        self.entities_version += 1
+
+    def entity_moved(self, entity):
+        """Called by Entity.move_to so position indexes (e.g. CombatResolver) rebuild."""
+        self.entities_version += 1
 
     def update(self):
         for entity in self.entities:
@@ -0,0 +1,223 @@
+import numpy as np
+
+# Status effects are stored as bit flags in Entity.status_flags
+STATUS_FLAGS = {
+    "burning": 1,
+    "poisoned": 2,
+    "stunned": 4,
+    "slowed": 8,
+}
+
+# Event kinds in the list returned by CombatResolver.resolve
+DAMAGE = "damage"
+STATUS = "status"
+DEFEATED = "defeated"
+
+DEFAULT_ACTION = {
+    "damage": 0,
+    "shape": "single",      # "single", "circle" (euclidean) or "square" (chebyshev)
+    "radius": 0,
+    "falloff": 0.0,         # fraction of damage lost at the edge of the area
+    "status": None,         # name from STATUS_FLAGS
+    "include_caster": False
+}
+
+
+class SpatialIndex:
+    """
+    Uniform-grid index over entity positions.
+    Entities are sorted by grid cell so an area query only looks at the
+    cells its bounding box overlaps, then filters candidates in one
+    vectorized distance check.
+    """
+    def __init__(self, entities, cell_size=8):
+        self.cell_size = cell_size
+        self.entities = list(entities)
+        count = len(self.entities)
+        self.xs = np.fromiter((e.x for e in self.entities), dtype=np.int64, count=count)
+        self.ys = np.fromiter((e.y for e in self.entities), dtype=np.int64, count=count)
+        self.index_of = {id(entity): i for i, entity in enumerate(self.entities)}
+
+        if count:
+            self.min_x = int(self.xs.min())
+            self.min_y = int(self.ys.min())
+            self.cols = int(self.xs.max() - self.min_x) // cell_size + 1
+            self.rows = int(self.ys.max() - self.min_y) // cell_size + 1
+        else:
+            self.min_x = self.min_y = 0
+            self.cols = self.rows = 0
+        keys = self._cell_keys(self.xs, self.ys)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def _cell_keys(self, xs, ys):
+        cx = (xs - self.min_x) // self.cell_size
+        cy = (ys - self.min_y) // self.cell_size
+        return cy * self.cols + cx
+
+    def query(self, x, y, radius, shape="circle"):
+        """Returns the indices of entities inside the area centred on (x, y)."""
+        if not self.rows:
+            return np.empty(0, dtype=np.int64)
+        size = self.cell_size
+        cx0 = max(0, (x - radius - self.min_x) // size)
+        cx1 = min(self.cols - 1, (x + radius - self.min_x) // size)
+        cy0 = max(0, (y - radius - self.min_y) // size)
+        cy1 = min(self.rows - 1, (y + radius - self.min_y) // size)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.empty(0, dtype=np.int64)
+
+        # Each grid row of the bounding box is one contiguous key range
+        row_keys = np.arange(cy0, cy1 + 1) * self.cols
+        starts = np.searchsorted(self.sorted_keys, row_keys + cx0, side="left")
+        ends = np.searchsorted(self.sorted_keys, row_keys + cx1, side="right")
+        if not (ends > starts).any():
+            return np.empty(0, dtype=np.int64)
+        candidates = np.concatenate([self.order[s:e] for s, e in zip(starts, ends) if e > s])
+
+        dx = np.abs(self.xs[candidates] - x)
+        dy = np.abs(self.ys[candidates] - y)
+        if shape == "square":
+            inside = np.maximum(dx, dy) <= radius
+        else:
+            inside = dx * dx + dy * dy <= radius * radius
+        return candidates[inside]
+
+    def distances(self, indices, x, y, shape="circle"):
+        dx = np.abs(self.xs[indices] - x)
+        dy = np.abs(self.ys[indices] - y)
+        if shape == "square":
+            return np.maximum(dx, dy).astype(np.float64)
+        return np.sqrt(dx * dx + dy * dy)
+
+
+class CombatResolver:
+    """
+    Resolves attacks and abilities against the entities of a Playfield.
+
+    Targets are gathered through a SpatialIndex and every hit of a batch is
+    applied in one vectorized pass: damage is summed per hit entity with
+    bincount, clamped against current health and applied with
+    Entity.take_damage to the hit entities only. The index is rebuilt lazily whenever the playfield's
+    entities_version changes (entities added, removed or moved).
+    """
+    def __init__(self, playfield, cell_size=8):
+        self.playfield = playfield
+        self.cell_size = cell_size
+        self.refresh()
+
+    def refresh(self):
+        """Rebuilds the spatial index from the playfield's entities."""
+        self.index = SpatialIndex(self.playfield.entities, self.cell_size)
+        self.version = self.playfield.entities_version
+        for entity in self.index.entities:
+            if getattr(entity, "entity_id", None) is None:
+                self.playfield.assign_entity_id(entity)
+
+    def _sync(self):
+        playfield = self.playfield
+        if (self.version != playfield.entities_version or
+                len(self.index.entities) != len(playfield.entities)):
+            self.refresh()
+
+    def entity_id(self, entity):
+        """The entity's id as used in events (stable across moves, adds and removes)."""
+        self._sync()
+        return entity.entity_id
+
+    def targets(self, caster, action, target_x, target_y):
+        """Returns (indices, distances) of entities hit by action at (x, y)."""
+        self._sync()
+        shape = action.get("shape", "single")
+        if shape == "single":
+            indices = self.index.query(target_x, target_y, 0, "square")
+        else:
+            indices = self.index.query(target_x, target_y, action.get("radius", 0), shape)
+        if caster is not None and not action.get("include_caster", False):
+            caster_index = self.index.index_of.get(id(caster))
+            if caster_index is not None:
+                indices = indices[indices != caster_index]
+        distances = self.index.distances(indices, target_x, target_y,
+                                         "square" if shape == "single" else shape)
+        return indices, distances
+
+    def resolve(self, caster, action, target_x, target_y):
+        """Resolves one action at (target_x, target_y); see resolve_batch."""
+        return self.resolve_batch([(caster, action, target_x, target_y)])
+
+    def resolve_batch(self, actions):
+        """
+        Resolves (caster, action, target_x, target_y) tuples simultaneously.
+
+        action is a dict with the keys of DEFAULT_ACTION. Returns a compact
+        event list of (kind, entity_id, value) tuples:
+            ("damage", id, amount), ("status", id, flag), ("defeated", id, 0)
+        """
+        self._sync()
+        hit_indices = []
+        hit_damage = []
+        status_indices = []
+        status_flags = []
+
+        for caster, action, target_x, target_y in actions:
+            indices, distances = self.targets(caster, action, target_x, target_y)
+            if not indices.size:
+                continue
+            damage = float(action.get("damage", 0))
+            radius = action.get("radius", 0)
+            falloff = action.get("falloff", 0.0)
+            if falloff and radius:
+                amounts = damage * (1.0 - falloff * np.minimum(distances / radius, 1.0))
+            else:
+                amounts = np.full(indices.size, damage)
+            hit_indices.append(indices)
+            hit_damage.append(amounts)
+
+            status = action.get("status")
+            if status:
+                status_indices.append(indices)
+                status_flags.append(np.full(indices.size, STATUS_FLAGS[status], dtype=np.int64))
+
+        events = []
+        entities = self.index.entities
+
+        # Aggregate over the entities actually hit, never over the whole roster
+        if hit_indices:
+            indices = np.concatenate(hit_indices)
+            amounts = np.rint(np.concatenate(hit_damage)).astype(np.int64)
+            # Armor applies per hit (read now, it may have changed), then all
+            # hits on one entity are summed
+            armor = np.fromiter(
+                (getattr(entities[i], "armor", 0) for i in indices.tolist()),
+                dtype=np.int64, count=indices.size
+            )
+            amounts = np.maximum(amounts - armor, 0)
+            hit, inverse = np.unique(indices, return_inverse=True)
+            totals = np.bincount(inverse, weights=amounts).astype(np.int64)
+            health = np.fromiter(
+                (entities[i].current_health for i in hit.tolist()), dtype=np.int64, count=hit.size
+            )
+            dealt = np.minimum(totals, health)
+            for i, amount in zip(hit.tolist(), dealt.tolist()):
+                if not amount:
+                    continue
+                entity = entities[i]
+                entity.take_damage(amount)
+                events.append((DAMAGE, entity.entity_id, amount))
+                if entity.current_health <= 0:
+                    events.append((DEFEATED, entity.entity_id, 0))
+
+        if status_indices:
+            indices = np.concatenate(status_indices)
+            flags = np.concatenate(status_flags)
+            affected, inverse = np.unique(indices, return_inverse=True)
+            combined = np.zeros(affected.size, dtype=np.int64)
+            np.bitwise_or.at(combined, inverse, flags)
+            for i, flag in zip(affected.tolist(), combined.tolist()):
+                entity = entities[i]
+                if entity.current_health <= 0:
+                    continue  # defeated entities don't pick up new effects
+                entity.status_flags = getattr(entity, "status_flags", 0) | flag
+                events.append((STATUS, entity.entity_id, flag))
+
+        return events
@@ -0,0 +1,116 @@
+"""
+Local HTTP stand-in for a remote scenario service.
+
+Serves GET /scenarios/<id> from <directory>/<id>.json (or an in-memory dict)
+with ETag / If-None-Match support and keep-alive, so the import pipeline can
+be exercised without a real backend:
+
+    python -m engine.scenario_server path/to/scenarios --port 8765
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+PREFIX = "/scenarios/"
+
+
+class ScenarioRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive between requests
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_GET(self):
+        if not self.path.startswith(PREFIX):
+            return self._send(404, b"")
+        scenario_id = unquote(self.path[len(PREFIX):])
+        body = self.server.load(scenario_id)
+        if body is None:
+            self.server.served.append((scenario_id, 404))
+            return self._send(404, b"")
+        if self.server.delay:
+            time.sleep(self.server.delay)  # simulated network latency
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.served.append((scenario_id, 304))
+            return self._send(304, b"", etag)
+        self.server.served.append((scenario_id, 200))
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status == 200:
+            self.send_header("Content-Type", "application/json")
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScenarioServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog (5) is below the client's pool size (10), so
+    # a burst of new connections would stall on SYN retries
+    request_queue_size = 64
+
+    def __init__(self, address, directory=None, scenarios=None, delay=0.0, verbose=False):
+        super().__init__(address, ScenarioRequestHandler)
+        self.directory = directory
+        self.scenarios = scenarios if scenarios is not None else {}
+        self.delay = delay
+        self.verbose = verbose
+        self.served = []  # (scenario_id, status) for each scenario request
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{PREFIX.rstrip('/')}"
+
+    def load(self, scenario_id):
+        """Returns the scenario's JSON bytes, or None if it doesn't exist."""
+        if scenario_id in self.scenarios:
+            return json.dumps(self.scenarios[scenario_id]).encode("utf-8")
+        if self.directory and os.sep not in scenario_id and "/" not in scenario_id:
+            path = os.path.join(self.directory, f"{scenario_id}.json")
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    return f.read()
+        return None
+
+
+def start_server(directory=None, scenarios=None, host="127.0.0.1", port=0, delay=0.0):
+    """Starts a ScenarioServer on a background thread; port 0 picks a free port."""
+    server = ScenarioServer((host, port), directory, scenarios, delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve scenario JSON files over HTTP.")
+    parser.add_argument("directory", help="directory containing <scenario_id>.json files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="seconds of simulated latency per request")
+    args = parser.parse_args(argv)
+    server = ScenarioServer((args.host, args.port), args.directory, delay=args.delay, verbose=True)
+    print(f"Serving {args.directory} at {server.base_url}/<id>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
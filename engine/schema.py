@@ -0,0 +1,372 @@
+"""
+Scenario schema: world size, layers, layout, characters and player_start.
+
+The schema is compiled once into nested closures that validate a document
+and fill in defaults in a single walk, collecting every error with its
+path (e.g. "layers[0].layout[3].x"). Run as a command to check a directory
+of scenario files:
+
+    python -m engine.schema path/to/scenarios [--write-normalized OUT_DIR]
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+from .config import ASCII_TILESET
+from .terrain import DEFAULT_HEIGHTMAP
+
+MISSING = object()
+
+
+class SchemaError(ValueError):
+    """Raised with every (path, message) problem found in a document."""
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("\n".join(f"{path}: {message}" for path, message in errors))
+
+
+# ---------------------------------------------------------------------
+# Schema nodes. Each is a plain dict; compile_node turns it into a
+# check(value, path, errors) closure that returns the normalised value.
+# ---------------------------------------------------------------------
+def integer(minimum=None, maximum=None, default=MISSING, choices=None):
+    return {"kind": "int", "min": minimum, "max": maximum, "default": default, "choices": choices}
+
+
+def number(minimum=None, maximum=None, default=MISSING):
+    return {"kind": "number", "min": minimum, "max": maximum, "default": default}
+
+
+def boolean(default=MISSING):
+    return {"kind": "bool", "default": default}
+
+
+def string(default=MISSING):
+    return {"kind": "str", "default": default}
+
+
+def array(items, default=MISSING):
+    return {"kind": "list", "items": items, "default": default}
+
+
+def mapping(values, default=MISSING, required=()):
+    """Object with arbitrary string keys, all holding the same kind of value."""
+    return {"kind": "map", "values": values, "default": default, "required": list(required)}
+
+
+def obj(fields, required=(), default=MISSING, check=None):
+    """Object with known fields; unknown keys are kept as they are."""
+    return {"kind": "object", "fields": fields, "required": set(required),
+            "default": default, "check": check}
+
+
+def either(*options, default=MISSING, normalize=None):
+    """First option that validates wins; normalize(value) may reshape it."""
+    return {"kind": "either", "options": options, "default": default, "normalize": normalize}
+
+
+TYPE_NAMES = {"int": "an integer", "number": "a number", "bool": "a boolean",
+              "str": "a string", "list": "a list", "map": "an object", "object": "an object"}
+
+
+def _type_error(kind, value):
+    return f"expected {TYPE_NAMES[kind]}, got {type(value).__name__}"
+
+
+def compile_node(node):
+    kind = node["kind"]
+
+    if kind in ("int", "number"):
+        minimum, maximum, choices = node["min"], node["max"], node.get("choices")
+        types = int if kind == "int" else (int, float)
+
+        def check(value, path, errors):
+            if not isinstance(value, types) or isinstance(value, bool):
+                errors.append((path, _type_error(kind, value)))
+            elif minimum is not None and value < minimum:
+                errors.append((path, f"{value} is below the minimum {minimum}"))
+            elif maximum is not None and value > maximum:
+                errors.append((path, f"{value} is above the maximum {maximum}"))
+            elif choices is not None and value not in choices:
+                errors.append((path, f"{value} is not one of {sorted(choices)}"))
+            return value
+        return check
+
+    if kind in ("bool", "str"):
+        expected = bool if kind == "bool" else str
+
+        def check(value, path, errors):
+            if not isinstance(value, expected):
+                errors.append((path, _type_error(kind, value)))
+            return value
+        return check
+
+    if kind == "list":
+        item_check = compile_node(node["items"])
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append((path, _type_error(kind, value)))
+                return value
+            return [item_check(item, f"{path}[{i}]", errors) for i, item in enumerate(value)]
+        return check
+
+    if kind == "map":
+        value_check = compile_node(node["values"])
+        required = node["required"]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, _type_error(kind, value)))
+                return value
+            errors.extend((f"{path}.{key}", "missing required field")
+                          for key in required if key not in value)
+            return {key: value_check(item, f"{path}.{key}", errors) for key, item in value.items()}
+        return check
+
+    if kind == "object":
+        fields = [
+            (key, compile_node(field), key in node["required"], field["default"])
+            for key, field in node["fields"].items()
+        ]
+        extra_check = node["check"]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, _type_error(kind, value)))
+                return value
+            result = dict(value)
+            for key, field_check, required, default in fields:
+                if key in value:
+                    result[key] = field_check(value[key], f"{path}.{key}", errors)
+                elif default is not MISSING:
+                    result[key] = copy.deepcopy(default)
+                elif required:
+                    errors.append((f"{path}.{key}", "missing required field"))
+            if extra_check is not None:
+                extra_check(result, path, errors)
+            return result
+        return check
+
+    if kind == "either":
+        options = [compile_node(option) for option in node["options"]]
+        normalize = node["normalize"]
+
+        def check(value, path, errors):
+            attempts = []
+            for option in options:
+                option_errors = []
+                result = option(value, path, option_errors)
+                if not option_errors:
+                    return normalize(result) if normalize else result
+                attempts.append(option_errors)
+            # Report the option that got furthest: prefer one whose type
+            # matched (errors below this path), then the fewest errors
+            errors.extend(min(
+                attempts, key=lambda errs: (all(p == path for p, _ in errs), len(errs))
+            ))
+            return value
+        return check
+
+    raise ValueError(f"unknown schema node kind {kind!r}")
+
+
+def compile_schema(node, root="scenario"):
+    """
+    Compiles a schema node into validate(document) -> normalised copy.
+    Raises SchemaError listing every problem.
+    """
+    check = compile_node(node)
+
+    def validate(document):
+        errors = []
+        result = check(document, root, errors)
+        if errors:
+            raise SchemaError(errors)
+        return result
+    return validate
+
+
+# ---------------------------------------------------------------------
+# Scenario schema
+# ---------------------------------------------------------------------
+TILE_ID = integer(choices=set(ASCII_TILESET))
+
+POSITION = obj({
+    "x": integer(minimum=0, default=0),
+    "y": integer(minimum=0, default=0),
+    "z": integer(default=0),
+})
+
+COUNT_VARIANCE = either(
+    integer(minimum=0),
+    obj({"count": integer(minimum=0, default=0), "variance": integer(minimum=0, default=0)}),
+    default={"count": 0, "variance": 0},
+    normalize=lambda v: v if isinstance(v, dict) else {"count": v, "variance": 0},
+)
+
+
+def _check_heightmap(heightmap, path, errors):
+    """min_z must not be above max_z; missing ends use the generator defaults."""
+    min_z = heightmap.get("min_z", DEFAULT_HEIGHTMAP["min_z"])
+    max_z = heightmap.get("max_z", DEFAULT_HEIGHTMAP["max_z"])
+    if isinstance(min_z, int) and isinstance(max_z, int) and min_z > max_z:
+        errors.append((f"{path}.min_z", f"{min_z} is above max_z {max_z}"))
+
+
+TERRAIN = obj({
+    "heightmap": obj({
+        "scale": number(minimum=1),
+        "octaves": integer(minimum=1, maximum=12),
+        "persistence": number(minimum=0, maximum=1),
+        "min_z": integer(),
+        "max_z": integer(),
+    }, check=_check_heightmap),
+    "water_level": integer(),
+    "mountain_level": integer(),
+    "walls": obj({
+        "density": number(minimum=0, maximum=1, default=0),
+        "scale": number(minimum=1, default=6),
+    }),
+    "connected": boolean(default=False),
+})
+
+LAYER = obj({
+    "fill_tile": TILE_ID | {"default": 0},
+    "random_walls": COUNT_VARIANCE,
+    "random_mountains": COUNT_VARIANCE,
+    "terrain": TERRAIN | {"default": {}},
+    "layout": array(obj({
+        "x": integer(minimum=0, default=0),
+        "y": integer(minimum=0, default=0),
+        "tile_id": TILE_ID | {"default": 0},
+        "z": integer(default=0),
+    }), default=[]),
+})
+
+
+def _fill_current_ap(character, path, errors):
+    """A character without current_ap starts the match with full AP."""
+    if "current_ap" not in character:
+        character["current_ap"] = character["max_ap"]
+
+
+CHARACTER = obj({
+    "current_ap": integer(minimum=0),
+    "max_ap": integer(minimum=0, default=100),
+    "speed": integer(minimum=0, default=5),
+    "pos": POSITION,
+    "inventory": mapping(integer(minimum=1)),
+}, check=_fill_current_ap)
+
+
+def _check_bounds(scenario, path, errors):
+    """Cross-field checks and defaults that need the world size."""
+    width, height = scenario.get("width"), scenario.get("height")
+    if not isinstance(width, int) or not isinstance(height, int):
+        return
+    if "player_start" not in scenario:
+        # (15, 10) as before, pulled inside maps smaller than that
+        scenario["player_start"] = {"x": min(15, width - 1), "y": min(10, height - 1), "z": 0}
+
+    def inside(pos, pos_path):
+        if not isinstance(pos, dict):
+            return
+        x, y = pos.get("x"), pos.get("y")
+        if isinstance(x, int) and x >= width:
+            errors.append((f"{pos_path}.x", f"{x} is outside width {width}"))
+        if isinstance(y, int) and y >= height:
+            errors.append((f"{pos_path}.y", f"{y} is outside height {height}"))
+
+    inside(scenario.get("player_start"), f"{path}.player_start")
+    layers = scenario.get("layers")
+    if isinstance(layers, list):
+        for i, layer in enumerate(layers):
+            layout = layer.get("layout") if isinstance(layer, dict) else None
+            if isinstance(layout, list):
+                for j, tile in enumerate(layout):
+                    inside(tile, f"{path}.layers[{i}].layout[{j}]")
+    characters = scenario.get("characters")
+    if isinstance(characters, dict):
+        for name, character in characters.items():
+            if isinstance(character, dict):
+                inside(character.get("pos"), f"{path}.characters.{name}.pos")
+
+
+SCENARIO = obj({
+    "width": integer(minimum=1, default=40),
+    "height": integer(minimum=1, default=25),
+    "seed": integer(minimum=0),
+    "player_start": POSITION,  # default depends on the size, see _check_bounds
+    "layers": array(LAYER, default=[]),
+    "characters": mapping(CHARACTER),
+}, check=_check_bounds)
+
+validate_scenario = compile_schema(SCENARIO)
+validate_characters = compile_schema(mapping(CHARACTER, required=["player"]), root="characters")
+
+
+# ---------------------------------------------------------------------
+# Batch validation command
+# ---------------------------------------------------------------------
+def validate_directory(directory, write_normalized=None, out=None):
+    """
+    Validates every *.json file under directory, reporting to out (stdout by default).
+    Returns (valid_count, invalid_count).
+    """
+    out = out if out is not None else sys.stdout
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(".json"))
+    paths.sort()
+
+    valid = invalid = 0
+    start = time.perf_counter()
+    for path in paths:
+        relative = os.path.relpath(path, directory)
+        try:
+            with open(path, "r") as f:
+                document = json.load(f)
+            normalized = validate_scenario(document)
+        except json.JSONDecodeError as e:
+            invalid += 1
+            print(f"{relative}: invalid JSON: {e}", file=out)
+            continue
+        except (UnicodeDecodeError, OSError) as e:
+            invalid += 1
+            print(f"{relative}: could not read: {e}", file=out)
+            continue
+        except SchemaError as e:
+            invalid += 1
+            for path_, message in e.errors:
+                print(f"{relative}: {path_}: {message}", file=out)
+            continue
+        valid += 1
+        if write_normalized:
+            target = os.path.join(write_normalized, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w") as f:
+                json.dump(normalized, f, indent=2)
+
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed if elapsed else 0
+    print(f"{valid} valid, {invalid} invalid, {len(paths)} files in {elapsed:.2f}s "
+          f"({rate:.0f} docs/s)", file=out)
+    return valid, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a directory of scenario JSON files.")
+    parser.add_argument("directory")
+    parser.add_argument("--write-normalized", metavar="OUT_DIR",
+                        help="write each valid scenario with defaults filled in to OUT_DIR")
+    args = parser.parse_args(argv)
+    _, invalid = validate_directory(args.directory, args.write_normalized)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
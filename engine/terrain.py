@@ -0,0 +1,195 @@
+import numpy as np
+
+# Tile IDs used by the generator (see ASCII_TILESET)
+WALL_TILE = 1
+WATER_TILE = 3
+MOUNTAIN_TILE = 4
+
+# Tiles that block movement when checking connectivity
+BLOCKING_TILES = (WALL_TILE,)
+
+# Largest height an entity can climb in one step (see Entity.move_to)
+MAX_CLIMB = 1
+
+DEFAULT_HEIGHTMAP = {
+    "scale": 32,         # size in tiles of the coarsest noise features
+    "octaves": 4,        # number of noise layers summed together
+    "persistence": 0.5,  # amplitude falloff per octave
+    "min_z": -3,
+    "max_z": 6
+}
+
+
+def make_rng(seed, layer_index=0):
+    """
+    Returns a NumPy Generator for one layer of a match.
+    The same (seed, layer_index) always yields the same stream, on any node.
+    """
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng([int(seed), layer_index])
+
+
+def new_seed():
+    """Draws a fresh match seed that can be stored and replayed later."""
+    return int(np.random.SeedSequence().entropy % (2 ** 63))
+
+
+def value_noise(rng, width, height, scale=32, octaves=4, persistence=0.5):
+    """
+    Fractal value noise in [0, 1] with shape (height, width).
+    Each octave is a coarse random grid upsampled with bilinear interpolation.
+    """
+    noise = np.zeros((height, width), dtype=np.float64)
+    amplitude = 1.0
+    total = 0.0
+    for octave in range(max(1, octaves)):
+        cell = max(1.0, scale / (2 ** octave))
+        grid_h = int(np.ceil(height / cell)) + 2
+        grid_w = int(np.ceil(width / cell)) + 2
+        grid = rng.random((grid_h, grid_w))
+
+        ys = np.arange(height) / cell
+        xs = np.arange(width) / cell
+        y0 = ys.astype(np.int64)
+        x0 = xs.astype(np.int64)
+        fy = (ys - y0)[:, None]
+        fx = (xs - x0)[None, :]
+        # Smoothstep the interpolation weights to hide the grid
+        fy = fy * fy * (3 - 2 * fy)
+        fx = fx * fx * (3 - 2 * fx)
+
+        # Separable bilinear: interpolate along x on the coarse rows, then along y
+        rows = grid[:, x0] * (1 - fx) + grid[:, x0 + 1] * fx
+        noise += (rows[y0] * (1 - fy) + rows[y0 + 1] * fy) * amplitude
+
+        total += amplitude
+        amplitude *= persistence
+    return noise / total
+
+
+def generate_heightmap(rng, width, height, heightmap_cfg=None):
+    """Returns an int16 heightmap scaled to [min_z, max_z]."""
+    cfg = dict(DEFAULT_HEIGHTMAP)
+    cfg.update(heightmap_cfg or {})
+    noise = value_noise(rng, width, height, cfg["scale"], cfg["octaves"], cfg["persistence"])
+    lo, hi = noise.min(), noise.max()
+    if hi > lo:
+        noise = (noise - lo) / (hi - lo)
+    heights = cfg["min_z"] + noise * (cfg["max_z"] - cfg["min_z"])
+    return np.rint(heights).astype(np.int16)
+
+
+def place_clustered(rng, width, height, density, scale=6):
+    """
+    Boolean mask covering roughly density of the map in clustered blobs,
+    taken from the top quantile of a noise field.
+    """
+    if density <= 0:
+        return np.zeros((height, width), dtype=bool)
+    noise = value_noise(rng, width, height, scale=scale, octaves=2)
+    threshold = np.quantile(noise, 1.0 - min(density, 1.0))
+    return noise > threshold
+
+
+def place_scattered(rng, ids, count, tile_id):
+    """Sets count random cells of ids to tile_id in one batch."""
+    if count <= 0:
+        return
+    height, width = ids.shape
+    ys = rng.integers(0, height, size=count)
+    xs = rng.integers(0, width, size=count)
+    ids[ys, xs] = tile_id
+
+
+def largest_component(passable, heights=None):
+    """
+    Returns a mask of the largest 4-connected region of passable cells.
+    With heights, neighbours only count as connected when the height
+    difference is at most MAX_CLIMB, so every cell in the region can walk
+    to every other one and back.
+    Uses label propagation with pointer jumping, so the work is done in a
+    handful of whole-array passes instead of a per-cell flood fill.
+    """
+    height, width = passable.shape
+    flat = passable.ravel()
+    if not flat.any():
+        return passable.copy()
+
+    index = np.arange(height * width).reshape(height, width)
+    horizontal = passable[:, :-1] & passable[:, 1:]
+    vertical = passable[:-1, :] & passable[1:, :]
+    if heights is not None:
+        heights = heights.astype(np.int32)
+        horizontal &= np.abs(heights[:, :-1] - heights[:, 1:]) <= MAX_CLIMB
+        vertical &= np.abs(heights[:-1, :] - heights[1:, :]) <= MAX_CLIMB
+    a = np.concatenate((index[:, :-1][horizontal], index[:-1, :][vertical]))
+    b = np.concatenate((index[:, 1:][horizontal], index[1:, :][vertical]))
+
+    labels = np.arange(height * width)
+    while a.size:
+        la = labels[a]
+        lb = labels[b]
+        pending = la != lb
+        if not pending.any():
+            break
+        a, b, la, lb = a[pending], b[pending], la[pending], lb[pending]
+        # Hook the larger root onto the smaller one, then flatten the trees
+        np.minimum.at(labels, np.maximum(la, lb), np.minimum(la, lb))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    sizes = np.bincount(labels[flat])
+    root = int(np.argmax(sizes))
+    return (labels == root).reshape(height, width) & passable
+
+
+def generate_terrain(width, height, terrain_cfg, rng, fill_tile=0):
+    """
+    Generates tile ids and heights for one layer from its "terrain" config.
+
+    terrain_cfg keys (all optional):
+        heightmap: {scale, octaves, persistence, min_z, max_z}
+        water_level: cells at or below this height become water
+        mountain_level: cells at or above this height become mountains
+        walls: {density, scale} clustered wall placement
+        connected: turn cells cut off from the largest open region into walls,
+                   counting steps steeper than MAX_CLIMB as cut off
+
+    Returns (ids, heights) as int16 arrays of shape (height, width).
+    """
+    ids = np.full((height, width), fill_tile, dtype=np.int16)
+    if "heightmap" in terrain_cfg:
+        heights = generate_heightmap(rng, width, height, terrain_cfg["heightmap"])
+    else:
+        heights = np.zeros((height, width), dtype=np.int16)
+
+    water_level = terrain_cfg.get("water_level")
+    if water_level is not None:
+        ids[heights <= water_level] = WATER_TILE
+
+    mountain_level = terrain_cfg.get("mountain_level")
+    if mountain_level is not None:
+        ids[heights >= mountain_level] = MOUNTAIN_TILE
+
+    walls = terrain_cfg.get("walls")
+    if walls:
+        mask = place_clustered(rng, width, height, walls.get("density", 0), walls.get("scale", 6))
+        ids[mask & (ids != WATER_TILE)] = WALL_TILE
+
+    if terrain_cfg.get("connected"):
+        ensure_connected(ids, heights)
+
+    return ids, heights
+
+
+def ensure_connected(ids, heights=None):
+    """
+    Walls off every open cell that cannot reach the largest open region
+    (and get back), taking the climb limit into account when heights are given.
+    """
+    passable = ~np.isin(ids, BLOCKING_TILES)
+    ids[passable & ~largest_component(passable, heights)] = WALL_TILE
@@ -0,0 +1,155 @@
+"""
+Immutable terrain shared between server worker processes.
+
+The parent process publishes each map's tile id and height grids into one
+multiprocessing.shared_memory block; workers attach to it by name and build
+Playfields whose SharedLayers read the grids in place. Memory then scales
+with the number of maps rather than the number of matches, and each match
+keeps its own copy-on-write overlay for destructible tiles.
+
+    # parent
+    store = TerrainStore()
+    store.publish("arena_01", playfield)
+    # worker
+    playfield = Playfield(1, 1)
+    playfield.attach_terrain("arena_01")
+"""
+import sys
+import threading
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .layers import SharedLayer
+
+# Block layout: int64 header [MAGIC, layer count, height, width], then
+# int16 grids shaped (layers, 2, height, width) holding ids and heights.
+MAGIC = 0x54504954  # "TIPT"
+HEADER_SIZE = 4 * 8
+PREFIX = "tactipy_"
+
+# Held while resource_tracker.register is patched out (Python < 3.13), so a
+# block created by TerrainStore on another thread is still registered
+_tracker_lock = threading.Lock()
+
+
+def _block_name(name):
+    return PREFIX + name
+
+
+def _attach_untracked(name):
+    """
+    Opens an existing block without registering it with the resource
+    tracker, which would otherwise unlink it when a worker exits. (Before
+    Python 3.13 attaching always registers, and unregistering afterwards
+    would drop the publisher's own registration when the tracker is shared.)
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedTerrain:
+    """
+    Read-only view of one published map.
+    Every SharedLayer made from it keeps it alive, so the block stays mapped
+    for as long as any layer (e.g. one held by a pathfinder) can read it.
+    """
+    def __init__(self, shm):
+        self.shm = shm
+        self.views = weakref.WeakSet()  # SharedLayers handed out by make_layers
+        header = np.ndarray((4,), dtype=np.int64, buffer=shm.buf)
+        if header[0] != MAGIC:
+            raise ValueError(f"shared memory block {shm.name!r} is not a published terrain")
+        layer_count, self.height, self.width = (int(v) for v in header[1:])
+        self.grids = np.ndarray(
+            (layer_count, 2, self.height, self.width), dtype=np.int16,
+            buffer=shm.buf, offset=HEADER_SIZE
+        )
+        self.grids.flags.writeable = False
+
+    @property
+    def layer_count(self):
+        return self.grids.shape[0]
+
+    def make_layers(self):
+        """Fresh SharedLayers for one match; writes stay in each layer's overlay."""
+        if self.grids is None:
+            raise RuntimeError(f"shared terrain {self.shm.name!r} is closed")
+        layers = [SharedLayer(grid[0], grid[1], owner=self) for grid in self.grids]
+        self.views.update(layers)
+        return layers
+
+    def close(self):
+        """
+        Unmaps the block. Raises RuntimeError while SharedLayers built from
+        it still exist, since they read the mapping directly.
+        """
+        if self.grids is None:
+            return
+        if len(self.views):
+            raise RuntimeError(
+                f"shared terrain {self.shm.name!r} still has {len(self.views)} layer(s) in use"
+            )
+        self.grids = None
+        self.shm.close()
+
+
+class TerrainStore:
+    """
+    Publishes maps into shared memory (in the parent process) and unlinks
+    them again on close().
+    """
+    def __init__(self):
+        self.published = {}
+
+    def publish(self, name, playfield):
+        """Copies the playfield's current layers into a new shared block."""
+        if not playfield.layers:
+            raise ValueError(f"cannot publish terrain {name!r}: the playfield has no layers")
+        arrays = [layer.to_arrays() for layer in playfield.layers]
+        return self.publish_arrays(name, arrays)
+
+    def publish_arrays(self, name, arrays):
+        """Publishes [(ids, heights), ...] grids, all shaped (height, width)."""
+        if name in self.published:
+            raise ValueError(f"terrain {name!r} is already published")
+        if not arrays:
+            raise ValueError(f"cannot publish terrain {name!r} without layers")
+        height, width = arrays[0][0].shape
+        size = HEADER_SIZE + len(arrays) * 2 * height * width * np.dtype(np.int16).itemsize
+        with _tracker_lock:
+            shm = shared_memory.SharedMemory(name=_block_name(name), create=True, size=size)
+        header = np.ndarray((4,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (MAGIC, len(arrays), height, width)
+        grids = np.ndarray((len(arrays), 2, height, width), dtype=np.int16,
+                           buffer=shm.buf, offset=HEADER_SIZE)
+        for i, (ids, heights) in enumerate(arrays):
+            grids[i, 0] = ids
+            grids[i, 1] = heights
+        del header, grids  # release the views so close() can unmap later
+        terrain = SharedTerrain(shm)
+        self.published[name] = terrain
+        return terrain
+
+    def unpublish(self, name):
+        terrain = self.published.pop(name)
+        # Unlink first: attached workers keep their mapping until they close
+        terrain.shm.unlink()
+        terrain.close()
+
+    def close(self):
+        for name in list(self.published):
+            self.unpublish(name)
+
+
+def attach(name):
+    """Attaches to a map published by a TerrainStore in another process."""
+    return SharedTerrain(_attach_untracked(_block_name(name)))
@@ -0,0 +1,101 @@
+from engine.combat import InitiativeScheduler, RoundSystem
+
+
+class Unit:
+    def __init__(self, name, speed, max_ap=10):
+        self.name = name
+        self.speed = speed
+        self.max_ap = max_ap
+        self.ap = 0
+
+    def __repr__(self):
+        return self.name
+
+
+def drain(scheduler):
+    order = []
+    while True:
+        turn = scheduler.next_actor()
+        if turn is None:
+            return order
+        order.append((turn[0].name, turn[1]))
+
+
+def make(*speeds):
+    units = [Unit(chr(ord("a") + i), speed) for i, speed in enumerate(speeds)]
+    scheduler = InitiativeScheduler()
+    scheduler.reset(units)
+    return scheduler, units
+
+
+def test_highest_initiative_first_ties_in_insertion_order():
+    scheduler, _ = make(3, 7, 3, 9)
+    assert drain(scheduler) == [("d", "turn"), ("b", "turn"), ("a", "turn"), ("c", "turn")]
+
+
+def test_delay_moves_pending_turn_down():
+    scheduler, (a, b, c) = make(9, 5, 3)
+    assert scheduler.delay(a, 4)
+    assert drain(scheduler) == [("b", "turn"), ("a", "turn"), ("c", "turn")]
+
+
+def test_delay_rejects_taken_turn_and_higher_initiative():
+    scheduler, (a, b) = make(9, 5)
+    assert scheduler.next_actor() == (a, "turn")
+    assert not scheduler.delay(a, 1)
+    assert not scheduler.delay(b, 6)
+    assert drain(scheduler) == [("b", "turn")]
+
+
+def test_interrupt_replaces_regular_turn():
+    scheduler, (a, b, c) = make(9, 5, 3)
+    assert scheduler.next_actor() == (a, "turn")
+    assert scheduler.interrupt(c)
+    assert drain(scheduler) == [("c", "interrupt"), ("b", "turn")]
+
+
+def test_interrupt_after_acting_is_refused():
+    scheduler, (a, b) = make(5, 9)
+    assert scheduler.next_actor() == (b, "turn")
+    assert not scheduler.interrupt(b)
+    assert drain(scheduler) == [("a", "turn")]
+
+
+def test_reaction_acts_before_next_turn_and_does_not_stack():
+    scheduler, (a, b) = make(9, 5)
+    assert scheduler.next_actor() == (a, "turn")
+    scheduler.react(a)
+    scheduler.react(a)
+    assert drain(scheduler) == [("a", "reaction"), ("b", "turn")]
+
+
+def test_remove_drops_every_tier():
+    scheduler, (a, b) = make(9, 5)
+    scheduler.react(b)
+    scheduler.remove(b)
+    assert len(scheduler) == 1
+    assert drain(scheduler) == [("a", "turn")]
+
+
+def test_compaction_keeps_heap_bounded():
+    units = [Unit(f"u{i}", i) for i in range(100)]
+    scheduler = InitiativeScheduler()
+    scheduler.reset(units)
+    for unit in units:
+        for initiative in range(unit.speed, unit.speed - 5, -1):
+            scheduler.delay(unit, initiative)
+    assert len(scheduler.heap) <= 2 * len(scheduler)
+    assert scheduler.peek() is units[-1]
+    assert [name for name, _ in drain(scheduler)] == [f"u{i}" for i in range(99, -1, -1)]
+
+
+def test_round_system_refreshes_ap_and_runs_every_turn():
+    units = [Unit("a", 2, max_ap=4), Unit("b", 8, max_ap=6)]
+    rounds = RoundSystem()
+    rounds.start_round(units)
+    assert [unit.ap for unit in units] == [4, 6]
+    assert rounds.next_turn() == (units[1], "turn")
+    assert rounds.current_actor is units[1]
+    assert rounds.next_turn() == (units[0], "turn")
+    assert rounds.next_turn() is None
+    assert rounds.current_actor is None
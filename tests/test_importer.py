@@ -0,0 +1,149 @@
+import asyncio
+import copy
+import time
+
+import pytest
+
+from engine import config_loader
+from engine.importer import BackgroundImporter, ScenarioCache, ScenarioImporter
+from engine.scenario_server import start_server
+from engine.schema import SchemaError
+
+SCENARIOS = {
+    "arena": {"width": 8, "height": 6, "seed": 1},
+    "cave": {"width": 12, "height": 9},
+    "broken": {"width": -1},
+}
+
+
+@pytest.fixture
+def server():
+    server = start_server(scenarios=copy.deepcopy(SCENARIOS))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(server, ids, cache=None, **kwargs):
+    """Loads ids through a fresh importer; returns (results, importer.cache)."""
+    async def load():
+        importer = ScenarioImporter(server.base_url, cache, **kwargs)
+        try:
+            return await importer.prefetch(ids), importer.cache
+        finally:
+            await importer.close()
+    return asyncio.run(load())
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fetch_validates_and_caches(server):
+    results, cache = fetch(server, ["arena"])
+    assert results["arena"]["player_start"] == {"x": 7, "y": 5, "z": 0}
+    fetch(server, ["arena"], cache)
+    assert server.served == [("arena", 200)]
+
+
+def test_expired_entries_are_revalidated_with_etag(server):
+    _, cache = fetch(server, ["arena"])
+    cache.entries["arena"][2] -= cache.ttl + 1  # expire it
+    assert cache.get("arena") is None
+
+    results, _ = fetch(server, ["arena"], cache)
+    assert results["arena"]["width"] == 8
+    assert server.served == [("arena", 200), ("arena", 304)]
+    assert cache.get("arena") is not None  # touched fresh again
+
+
+def test_changed_scenario_is_refetched_after_ttl(server):
+    _, cache = fetch(server, ["arena"])
+    server.scenarios["arena"] = {"width": 9, "height": 6}
+    cache.entries["arena"][2] -= cache.ttl + 1
+    results, _ = fetch(server, ["arena"], cache)
+    assert results["arena"]["width"] == 9
+    assert server.served[-1] == ("arena", 200)
+
+
+def test_lru_eviction():
+    cache = ScenarioCache(max_entries=2)
+    cache.put("a", {"n": 1}, None)
+    cache.put("b", {"n": 2}, None)
+    cache.get("a")  # a is now the most recently used
+    cache.put("c", {"n": 3}, None)
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get("b") is None
+
+
+def test_cache_hands_out_copies():
+    cache = ScenarioCache()
+    cache.put("a", {"layers": [{"fill_tile": 0}]}, "v1")
+    cache.get("a")["layers"].clear()
+    data, validator = cache.get_stale("a")
+    data["layers"][0]["fill_tile"] = 5
+    assert cache.get("a") == {"layers": [{"fill_tile": 0}]}
+    assert validator == "v1"
+
+
+def test_concurrent_requests_share_one_fetch():
+    server = start_server(scenarios=copy.deepcopy(SCENARIOS), delay=0.2)
+    try:
+        async def load():
+            importer = ScenarioImporter(server.base_url)
+            try:
+                return await asyncio.gather(*(importer.get("cave") for _ in range(5)))
+            finally:
+                await importer.close()
+        results = asyncio.run(load())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert server.served == [("cave", 200)]
+    assert all(result == results[0] for result in results)
+    results[0]["width"] = 99
+    assert results[1]["width"] == 12  # each caller got its own copy
+
+
+def test_prefetch_reports_failures_per_id(server):
+    results, cache = fetch(server, ["arena", "missing", "broken", "cave"])
+    assert results["arena"]["width"] == 8
+    assert results["cave"]["width"] == 12
+    assert isinstance(results["missing"], IOError)
+    assert isinstance(results["broken"], SchemaError)
+    assert set(cache.entries) == {"arena", "cave"}
+
+
+def test_background_get_cached_backs_off_after_failure(server):
+    importer = BackgroundImporter(server.base_url, retry_after=60.0)
+    try:
+        assert importer.get_cached("missing") is None
+        wait_until(lambda: "missing" in importer.failures and not importer.pending)
+        for _ in range(10):
+            assert importer.get_cached("missing") is None
+        assert server.served == [("missing", 404)]
+
+        importer.failures["missing"] = time.monotonic() - 1  # backoff elapsed
+        server.scenarios["missing"] = {"width": 5, "height": 5}
+        importer.get_cached("missing")
+        wait_until(lambda: importer.get_cached("missing") is not None)
+        assert "missing" not in importer.failures
+        assert server.served == [("missing", 404), ("missing", 200)]
+    finally:
+        importer.close()
+
+
+def test_load_data_reuses_one_importer_per_source(server):
+    try:
+        first = config_loader.load_data_from_db_or_http_or_llm(server.base_url, "arena")
+        first["width"] = 0
+        second = config_loader.load_data_from_db_or_http_or_llm(server.base_url, "arena")
+        assert second["width"] == 8
+        assert list(config_loader.scenario_importers) == [server.base_url]
+        assert server.served == [("arena", 200)]
+    finally:
+        config_loader.close_scenario_importers()
+    assert config_loader.scenario_importers == {}
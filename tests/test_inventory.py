@@ -0,0 +1,84 @@
+import pytest
+
+from engine.inventory import Inventory, ItemRegistry
+
+ITEMS = [
+    {"id": "potion", "name": "Potion", "category": "consumable", "weight": 0.5, "value": 25,
+     "max_stack": 10, "tags": ["healing"], "effects": {"heal": 30}},
+    {"id": "bomb", "name": "Bomb", "category": "consumable", "weight": 1.0, "value": 40,
+     "max_stack": 5, "tags": ["fire", "thrown"]},
+    {"id": "sword", "name": "Sword", "category": "weapon", "weight": 3.0, "value": 100,
+     "stackable": False, "tags": ["metal"]},
+]
+
+
+@pytest.fixture
+def registry():
+    registry = ItemRegistry()
+    registry.load_items(ITEMS)
+    return registry
+
+
+def test_registry_interns_and_indexes(registry):
+    assert len(registry) == 3
+    potion = registry.get("potion")
+    assert potion.data == {"effects": {"heal": 30}}
+    assert registry.get("sword").max_stack == 1
+    assert registry.ids_in_category("consumable") == {"potion", "bomb"}
+    assert registry.ids_with_tag("fire") == {"bomb"}
+
+
+def test_reregistering_updates_indexes(registry):
+    registry.load_items([{"id": "bomb", "name": "Bomb", "category": "material", "tags": []}])
+    assert registry.ids_in_category("consumable") == {"potion"}
+    assert registry.ids_in_category("material") == {"bomb"}
+    assert registry.ids_with_tag("fire") == set()
+
+
+def test_load_items_reports_every_problem_and_registers_nothing():
+    registry = ItemRegistry()
+    bad = [
+        {"id": ["x"], "name": "List id", "category": "misc"},
+        {"id": "a", "name": "A", "category": "misc", "weight": -1},
+        {"id": "a", "name": "A again", "category": "misc", "max_stack": 0},
+        "not an item",
+        {"id": "b", "category": "misc", "tags": [1]},
+    ]
+    with pytest.raises(ValueError) as excinfo:
+        registry.load_items(bad)
+    message = str(excinfo.value)
+    for expected in ("items[0].id: wrong type list", "items[1].weight", "items[2].id: duplicate",
+                     "items[2].max_stack", "items[3]: expected an object", "items[4].name: missing",
+                     "items[4].tags"):
+        assert expected in message
+    assert len(registry) == 0
+
+
+def test_inventory_totals_and_indexes(registry):
+    inventory = Inventory(registry)
+    inventory.add("potion", 12)
+    inventory.add("sword")
+    assert inventory.total_weight == pytest.approx(9.0)
+    assert inventory.total_value == 400
+    assert inventory.items_in_category("consumable") == {"potion": 12}
+    assert inventory.items_with_tag("metal") == {"sword": 1}
+    assert sorted(inventory.stacks()) == [("potion", 2), ("potion", 10), ("sword", 1)]
+
+    assert not inventory.remove("potion", 13)
+    assert inventory.remove("potion", 12)
+    assert "potion" not in inventory
+    assert inventory.items_in_category("consumable") == {}
+    assert inventory.total_weight == pytest.approx(3.0)
+    assert inventory.remove("sword")
+    assert inventory.total_weight == 0.0
+
+
+def test_from_dict_round_trips_and_validates(registry):
+    inventory = Inventory.from_dict({"potion": 3, "bomb": 1}, registry)
+    assert Inventory.from_dict(inventory.to_dict(), registry).to_dict() == {"potion": 3, "bomb": 1}
+    with pytest.raises(ValueError) as excinfo:
+        Inventory.from_dict({"ghost": 1, "potion": 0, "bomb": True}, registry)
+    message = str(excinfo.value)
+    assert "ghost: unknown item" in message
+    assert "potion: count must be a positive integer" in message
+    assert "bomb: count must be a positive integer" in message
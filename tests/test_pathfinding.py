@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pytest
+
+from engine.layers import Layer
+from engine.pathfinding import HierarchicalPathfinder, grid_astar
+from engine.playfield import Playfield
+from engine.terrain import generate_terrain, make_rng
+
+
+def make_playfield(seed, size=64, heightmap=None, wall_density=0.0):
+    terrain_cfg = {
+        "heightmap": heightmap or {"scale": 8, "octaves": 3, "min_z": -4, "max_z": 8},
+        "walls": {"density": wall_density, "scale": 4},
+    }
+    ids, heights = generate_terrain(size, size, terrain_cfg, make_rng(seed), fill_tile=2)
+    playfield = Playfield(size, size)
+    playfield.layers = [Layer.from_arrays(ids, heights)]
+    return playfield
+
+
+def check_against_astar(pathfinder, queries, max_ratio):
+    grid = pathfinder.grid
+    width = grid.width
+    for start, goal in queries:
+        expected = grid_astar(grid, start[1] * width + start[0], goal[1] * width + goal[0])
+        path = pathfinder.find_path(start, goal)
+        if expected is None:
+            assert path == [], (start, goal)
+            continue
+        assert path, f"no path from {start} to {goal}, A* found {len(expected)} tiles"
+        assert path[0] == start and path[-1] == goal
+        for (ax, ay), (bx, by) in zip(path, path[1:]):
+            assert abs(ax - bx) + abs(ay - by) == 1
+            assert grid.can_step(ay * width + ax, by * width + bx)
+        assert len(path) <= len(expected) * max_ratio, (start, goal)
+
+
+def random_queries(pathfinder, seed, count=40):
+    """Random (start, goal) pairs on unblocked cells."""
+    grid = pathfinder.grid
+    open_cells = [i for i in range(grid.width * grid.height) if not grid.blocked[i]]
+    rng = random.Random(seed)
+    return [tuple((i % grid.width, i // grid.width) for i in rng.sample(open_cells, 2))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_height_only_maps_match_astar(seed):
+    pathfinder = HierarchicalPathfinder(make_playfield(seed))
+    check_against_astar(pathfinder, random_queries(pathfinder, seed), max_ratio=2.5)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_mixed_maps_match_astar(seed):
+    pathfinder = HierarchicalPathfinder(make_playfield(seed, wall_density=0.2))
+    check_against_astar(pathfinder, random_queries(pathfinder, seed), max_ratio=2.5)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_repair_after_set_tile(seed):
+    playfield = make_playfield(seed, wall_density=0.1)
+    pathfinder = HierarchicalPathfinder(playfield)
+    queries = random_queries(pathfinder, seed, count=20)
+    rng = random.Random(seed)
+    for _ in range(50):
+        playfield.layers[0].set_tile(rng.randrange(64), rng.randrange(64),
+                                     rng.choice([1, 2]), rng.randint(-4, 8))
+    check_against_astar(pathfinder, queries, max_ratio=2.5)
+
+
+def test_close_removes_listener():
+    playfield = make_playfield(0)
+    pathfinder = HierarchicalPathfinder(playfield)
+    pathfinder.close()
+    assert playfield.layers[0].listeners == []
+    playfield.layers[0].set_tile(0, 0, 1)
+    assert not pathfinder.dirty
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from engine.entities import Entity
+from engine.layers import Layer
+from engine.playfield import Playfield
+from engine.resolution import DAMAGE, DEFEATED, STATUS, STATUS_FLAGS, CombatResolver, SpatialIndex
+
+
+def make_playfield(positions, size=32):
+    playfield = Playfield(size, size)
+    playfield.layers = [Layer(size, size)]
+    for x, y in positions:
+        playfield.add_entity(Entity(x, y))
+    return playfield
+
+
+@pytest.mark.parametrize("shape", ["circle", "square"])
+def test_spatial_query_matches_brute_force(shape):
+    rng = random.Random(3)
+    entities = [Entity(rng.randrange(64), rng.randrange(64)) for _ in range(300)]
+    index = SpatialIndex(entities, cell_size=8)
+    for _ in range(50):
+        x, y, radius = rng.randrange(64), rng.randrange(64), rng.randrange(0, 10)
+        found = sorted(index.query(x, y, radius, shape).tolist())
+        expected = [
+            i for i, e in enumerate(entities)
+            if (max(abs(e.x - x), abs(e.y - y)) <= radius if shape == "square"
+                else (e.x - x) ** 2 + (e.y - y) ** 2 <= radius * radius)
+        ]
+        assert found == expected
+
+
+def test_falloff_and_armor_apply_per_hit():
+    playfield = make_playfield([(10, 10), (12, 10)])
+    near, far = playfield.entities
+    far.armor = 5
+    resolver = CombatResolver(playfield)
+    events = resolver.resolve(None, {"damage": 40, "shape": "circle", "radius": 4,
+                                     "falloff": 0.5}, 10, 10)
+    # far is at distance 2 of 4: 40 * (1 - 0.5 * 0.5) = 30, minus 5 armor
+    assert (DAMAGE, near.entity_id, 40) in events
+    assert (DAMAGE, far.entity_id, 25) in events
+    assert (near.current_health, far.current_health) == (60, 75)
+
+
+def test_batch_sums_hits_and_clamps_to_health():
+    playfield = make_playfield([(5, 5)])
+    target = playfield.entities[0]
+    target.armor = 10
+    resolver = CombatResolver(playfield)
+    blast = {"damage": 45, "shape": "square", "radius": 1, "status": "burning"}
+    events = resolver.resolve_batch([(None, blast, 5, 5), (None, blast, 6, 6), (None, blast, 4, 5)])
+    # three hits of 35 after armor, clamped to the 100 health left
+    assert events == [(DAMAGE, target.entity_id, 100), (DEFEATED, target.entity_id, 0)]
+    assert target.current_health == 0
+    assert target.status_flags == 0
+
+
+def test_status_flags_combine():
+    playfield = make_playfield([(5, 5)])
+    target = playfield.entities[0]
+    resolver = CombatResolver(playfield)
+    events = resolver.resolve_batch([
+        (None, {"damage": 0, "status": "burning"}, 5, 5),
+        (None, {"damage": 0, "status": "slowed"}, 5, 5),
+    ])
+    flags = STATUS_FLAGS["burning"] | STATUS_FLAGS["slowed"]
+    assert events == [(STATUS, target.entity_id, flags)]
+    assert target.status_flags == flags
+
+
+def test_caster_is_excluded_unless_requested():
+    playfield = make_playfield([(5, 5), (6, 5)])
+    caster, other = playfield.entities
+    resolver = CombatResolver(playfield)
+    nova = {"damage": 10, "shape": "circle", "radius": 2}
+    assert resolver.resolve(caster, nova, 5, 5) == [(DAMAGE, other.entity_id, 10)]
+    events = resolver.resolve(caster, dict(nova, include_caster=True), 5, 5)
+    assert {entity_id for _, entity_id, _ in events} == {caster.entity_id, other.entity_id}
+
+
+def test_index_follows_moves_adds_and_removes():
+    playfield = make_playfield([(2, 2), (20, 20)])
+    mover, other = playfield.entities
+    resolver = CombatResolver(playfield)
+    hit = {"damage": 10}
+
+    assert mover.move_to(3, 2, playfield)
+    assert resolver.resolve(None, hit, 2, 2) == []
+    assert resolver.resolve(None, hit, 3, 2) == [(DAMAGE, mover.entity_id, 10)]
+
+    newcomer = Entity(8, 8)
+    playfield.add_entity(newcomer)
+    assert resolver.resolve(None, hit, 8, 8) == [(DAMAGE, newcomer.entity_id, 10)]
+
+    playfield.remove_entity(mover)
+    assert resolver.resolve(None, hit, 3, 2) == []
+    assert resolver.resolve(None, hit, 20, 20) == [(DAMAGE, other.entity_id, 10)]
+
+
+def test_entity_ids_are_stable():
+    playfield = make_playfield([(1, 1), (2, 2), (3, 3)])
+    first, second, third = playfield.entities
+    resolver = CombatResolver(playfield)
+    before = resolver.entity_id(third)
+    playfield.remove_entity(first)
+    assert resolver.entity_id(third) == before
+    assert resolver.resolve(None, {"damage": 5}, 3, 3) == [(DAMAGE, before, 5)]
+    assert len({first.entity_id, second.entity_id, third.entity_id}) == 3
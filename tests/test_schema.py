@@ -0,0 +1,119 @@
+import io
+import json
+
+import pytest
+
+from engine.schema import (
+    SchemaError, main, validate_characters, validate_directory, validate_scenario
+)
+
+
+def messages(document, validate=validate_scenario):
+    with pytest.raises(SchemaError) as excinfo:
+        validate(document)
+    return dict(excinfo.value.errors)
+
+
+def test_defaults_are_filled_in():
+    scenario = validate_scenario({"layers": [{"random_walls": 3}]})
+    assert (scenario["width"], scenario["height"]) == (40, 25)
+    assert scenario["player_start"] == {"x": 15, "y": 10, "z": 0}
+    layer = scenario["layers"][0]
+    assert layer["random_walls"] == {"count": 3, "variance": 0}
+    assert layer["random_mountains"] == {"count": 0, "variance": 0}
+    assert layer["terrain"] == {}
+    assert layer["layout"] == []
+
+
+def test_player_start_default_stays_inside_small_maps():
+    scenario = validate_scenario({"width": 8, "height": 4})
+    assert scenario["player_start"] == {"x": 7, "y": 3, "z": 0}
+
+
+def test_input_is_not_modified():
+    document = {"width": 10, "height": 10, "layers": [{}]}
+    validate_scenario(document)
+    assert document == {"width": 10, "height": 10, "layers": [{}]}
+
+
+def test_every_error_is_reported_with_its_path():
+    errors = messages({
+        "width": 10, "height": 0, "seed": "x",
+        "player_start": {"x": 12},
+        "layers": [{"fill_tile": 9, "random_walls": {"count": -1},
+                    "layout": [{"x": 10, "y": 0, "tile_id": 1}]}],
+    })
+    assert errors["scenario.height"] == "0 is below the minimum 1"
+    assert errors["scenario.seed"] == "expected an integer, got str"
+    assert errors["scenario.layers[0].fill_tile"].startswith("9 is not one of")
+    assert errors["scenario.layers[0].random_walls.count"] == "-1 is below the minimum 0"
+    assert errors["scenario.player_start.x"] == "12 is outside width 10"
+
+
+def test_positions_outside_the_map():
+    errors = messages({
+        "width": 10, "height": 5, "player_start": {"x": 10, "y": 2},
+        "layers": [{"layout": [{"x": 3, "y": 5}]}],
+        "characters": {"orc": {"current_ap": 5, "pos": {"x": 0, "y": 9}}},
+    })
+    assert errors == {
+        "scenario.player_start.x": "10 is outside width 10",
+        "scenario.layers[0].layout[0].y": "5 is outside height 5",
+        "scenario.characters.orc.pos.y": "9 is outside height 5",
+    }
+
+
+def test_heightmap_range_must_be_ordered():
+    def terrain(heightmap):
+        return {"layers": [{"terrain": {"heightmap": heightmap}}]}
+    path = "scenario.layers[0].terrain.heightmap.min_z"
+    assert messages(terrain({"min_z": 4, "max_z": 2})) == {path: "4 is above max_z 2"}
+    assert messages(terrain({"min_z": 7})) == {path: "7 is above max_z 6"}
+    assert validate_scenario(terrain({"min_z": 2, "max_z": 2}))
+
+
+def test_characters_config():
+    characters = validate_characters({"player": {"speed": 3}, "ally": {"max_ap": 50}})
+    assert characters["player"] == {"current_ap": 100, "max_ap": 100, "speed": 3}
+    assert characters["ally"]["current_ap"] == 50
+    assert messages({"ally": {}}, validate_characters) == {
+        "characters.player": "missing required field"
+    }
+    assert messages({"player": {"current_ap": -1, "inventory": {"potion": 0}}},
+                    validate_characters) == {
+        "characters.player.current_ap": "-1 is below the minimum 0",
+        "characters.player.inventory.potion": "0 is below the minimum 1",
+    }
+
+
+def write(directory, name, content):
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content if isinstance(content, bytes) else json.dumps(content).encode())
+
+
+def test_validate_directory_reports_bad_files(tmp_path):
+    write(tmp_path, "good.json", {"width": 5, "height": 5})
+    write(tmp_path, "nested/bad_schema.json", {"width": 0})
+    write(tmp_path, "bad_json.json", b"{not json")
+    write(tmp_path, "bad_utf8.json", b"\xff\xfe\x00")
+    write(tmp_path, "notes.txt", b"ignored")
+    out = io.StringIO()
+    normalized = tmp_path.parent / (tmp_path.name + "_out")
+
+    assert validate_directory(str(tmp_path), str(normalized), out=out) == (1, 3)
+    report = out.getvalue()
+    assert "bad_json.json: invalid JSON" in report
+    assert "bad_utf8.json: could not read" in report
+    assert "bad_schema.json: scenario.width: 0 is below the minimum 1" in report
+    written = json.loads((normalized / "good.json").read_text())
+    assert written["player_start"] == {"x": 4, "y": 4, "z": 0}
+    assert not (normalized / "nested").exists()
+
+
+def test_main_exit_code(tmp_path, capsys):
+    write(tmp_path, "good.json", {"width": 5, "height": 5})
+    assert main([str(tmp_path)]) == 0
+    write(tmp_path, "bad.json", {"height": "tall"})
+    assert main([str(tmp_path)]) == 1
+    assert "1 valid, 1 invalid, 2 files" in capsys.readouterr().out
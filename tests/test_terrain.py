@@ -0,0 +1,99 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from engine.playfield import Playfield
+from engine.terrain import BLOCKING_TILES, MAX_CLIMB
+
+TERRAIN = {
+    "heightmap": {"scale": 6, "octaves": 3, "min_z": -4, "max_z": 8},
+    "water_level": -3,
+    "mountain_level": 7,
+    "walls": {"density": 0.3, "scale": 3},
+}
+
+
+def load(monkeypatch, config, playfield=None):
+    monkeypatch.setattr("engine.playfield.load_world_config", lambda path: config)
+    playfield = playfield or Playfield(1, 1)
+    playfield.init_from_config("unused")
+    return playfield
+
+
+def arrays(playfield):
+    return [layer.to_arrays() for layer in playfield.layers]
+
+
+def reachable(ids, heights, start):
+    """Cells reachable from start, stepping at most MAX_CLIMB up or down."""
+    height, width = ids.shape
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (0 <= nx < width and 0 <= ny < height and (nx, ny) not in seen
+                    and ids[ny, nx] not in BLOCKING_TILES
+                    and abs(int(heights[ny, nx]) - int(heights[y, x])) <= MAX_CLIMB):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return seen
+
+
+def open_cells(ids):
+    return {(int(x), int(y)) for y, x in zip(*np.nonzero(~np.isin(ids, BLOCKING_TILES)))}
+
+
+def test_same_seed_generates_identical_layers(monkeypatch):
+    config = {"width": 48, "height": 32, "seed": 1234, "layers": [
+        {"fill_tile": 2, "terrain": TERRAIN, "random_walls": {"count": 20, "variance": 5}},
+        {"random_mountains": 10, "layout": [{"x": 1, "y": 1, "tile_id": 1, "z": 2}]},
+    ]}
+    first, second = arrays(load(monkeypatch, config)), arrays(load(monkeypatch, config))
+    for (ids_a, heights_a), (ids_b, heights_b) in zip(first, second):
+        assert np.array_equal(ids_a, ids_b)
+        assert np.array_equal(heights_a, heights_b)
+
+    other = arrays(load(monkeypatch, dict(config, seed=1235)))
+    assert not np.array_equal(first[0][1], other[0][1])
+
+
+def test_missing_seed_is_drawn_and_reproducible(monkeypatch):
+    config = {"width": 24, "height": 16, "layers": [{"terrain": TERRAIN}]}
+    playfield = load(monkeypatch, config)
+    assert playfield.seed is not None
+    again = load(monkeypatch, dict(config, seed=playfield.seed))
+    assert np.array_equal(arrays(playfield)[0][0], arrays(again)[0][0])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_connected_open_cells_are_mutually_reachable(monkeypatch, seed):
+    config = {"width": 48, "height": 40, "seed": seed, "layers": [
+        {"terrain": dict(TERRAIN, connected=True), "random_walls": 60},
+    ]}
+    (ids, heights), = arrays(load(monkeypatch, config))
+    cells = open_cells(ids)
+    assert len(cells) > ids.size // 4
+    # Steps are symmetric, so one flood fill covering every open cell
+    # means each open cell can reach every other
+    assert reachable(ids, heights, min(cells)) == cells
+
+
+def test_unconnected_terrain_can_be_split(monkeypatch):
+    config = {"width": 48, "height": 40, "seed": 0, "layers": [{"terrain": TERRAIN}]}
+    (ids, heights), = arrays(load(monkeypatch, config))
+    cells = open_cells(ids)
+    assert reachable(ids, heights, min(cells)) != cells
+
+
+def test_missing_size_keeps_the_playfield_size(monkeypatch):
+    playfield = load(monkeypatch, {"layers": [{}]}, Playfield(12, 7))
+    assert (playfield.width, playfield.height) == (12, 7)
+    assert playfield.layers[0].to_arrays()[0].shape == (7, 12)
+
+    playfield = Playfield(12, 7)
+    monkeypatch.setattr("engine.playfield.load_world_config", lambda path: {"width": 30})
+    config = playfield.init_from_config("unused")
+    assert (playfield.width, playfield.height) == (30, 7)
+    assert config["player_start"] == {"x": 15, "y": 6, "z": 0}
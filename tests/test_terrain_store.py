@@ -0,0 +1,109 @@
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+from engine.layers import Layer
+from engine.pathfinding import HierarchicalPathfinder
+from engine.playfield import Playfield
+from engine.terrain_store import TerrainStore, attach
+
+_names = itertools.count()
+
+
+def unique_name():
+    return f"test_{os.getpid()}_{next(_names)}"
+
+
+def make_playfield(width=12, height=8):
+    ids = np.arange(width * height, dtype=np.int16).reshape(height, width) % 5
+    heights = (np.arange(width * height, dtype=np.int16).reshape(height, width) % 7) - 3
+    playfield = Playfield(width, height)
+    playfield.layers = [Layer.from_arrays(ids, heights), Layer(width, height, fill_tile=2)]
+    return playfield
+
+
+@pytest.fixture
+def store():
+    store = TerrainStore()
+    yield store
+    store.close()
+
+
+def test_attach_reads_published_layers(store):
+    source = make_playfield()
+    name = unique_name()
+    store.publish(name, source)
+
+    playfield = Playfield(1, 1)
+    playfield.attach_terrain(name)
+    assert (playfield.width, playfield.height) == (12, 8)
+    assert len(playfield.layers) == 2
+    for shared, original in zip(playfield.layers, source.layers):
+        for y in range(8):
+            for x in range(12):
+                assert shared.get_tile(x, y) == original.get_tile(x, y)
+    playfield.detach_terrain()
+
+
+def test_overlay_is_per_playfield(store):
+    name = unique_name()
+    store.publish(name, make_playfield())
+    first, second = Playfield(1, 1), Playfield(1, 1)
+    first.attach_terrain(name)
+    second.attach_terrain(name)
+    before = second.layers[0].get_tile(3, 3)
+
+    first.layers[0].set_tile(3, 3, 1, 9)
+    assert first.layers[0].get_tile(3, 3) == {"id": 1, "z": 9}
+    assert second.layers[0].get_tile(3, 3) == before
+    ids, heights = first.layers[0].to_arrays()
+    assert (ids[3, 3], heights[3, 3]) == (1, 9)
+    first.detach_terrain()
+    second.detach_terrain()
+
+
+def test_close_refuses_while_layers_are_alive(store):
+    name = unique_name()
+    store.publish(name, make_playfield())
+    terrain = attach(name)
+    layers = terrain.make_layers()
+    with pytest.raises(RuntimeError):
+        terrain.close()
+    assert layers[0].get_tile(3, 3)["id"] == (3 * 12 + 3) % 5
+    del layers
+    terrain.close()
+
+
+def test_reattach_keeps_old_layers_readable(store):
+    name = unique_name()
+    store.publish(name, make_playfield())
+    playfield = Playfield(1, 1)
+    playfield.attach_terrain(name)
+    pathfinder = HierarchicalPathfinder(playfield)
+    old_layer = playfield.layers[0]
+    expected = old_layer.get_tile(5, 5)
+
+    playfield.attach_terrain(name)
+    assert old_layer.get_tile(5, 5) == expected
+    assert pathfinder.find_path((0, 0), (0, 0)) == [(0, 0)]
+    pathfinder.close()
+    playfield.detach_terrain()
+
+
+def test_init_from_config_detaches(store, monkeypatch):
+    name = unique_name()
+    store.publish(name, make_playfield())
+    playfield = Playfield(1, 1)
+    playfield.attach_terrain(name)
+    monkeypatch.setattr("engine.playfield.load_world_config",
+                        lambda path: {"width": 6, "height": 4, "layers": [{}]})
+    playfield.init_from_config("unused")
+    assert playfield.terrain is None
+    assert (playfield.width, playfield.height) == (6, 4)
+
+
+def test_publish_without_layers_is_rejected(store):
+    with pytest.raises(ValueError, match="no layers"):
+        store.publish(unique_name(), Playfield(4, 4))